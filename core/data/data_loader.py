@@ -2,90 +2,236 @@
 Data loader module for loading stock and option chain data from CSV files.
 """
 
-import json
+import functools
 import os
 import pandas as pd
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from ..json_io import read_json, write_json
 
-# Load settings
-settings_path = Path(__file__).parent / "settings.json"
 try:
-    with open(settings_path, "r") as f:
-        settings = json.load(f)
-except FileNotFoundError:
-    print(f"Settings file not found at {settings_path}")
-    settings = {
-        "stock_data_path": "F:/inputs/stocks/",
-        "option_data_path": "F:/inputs/options/log",
-        "tickers": ["SPY"]
-    }
-    # Create settings file if it doesn't exist
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+# Set False to parse the CSVs on every load; the pyarrow stock parser is kept
+PARQUET_CACHE = HAVE_PYARROW
+
+settings_path = Path(__file__).parent / "settings.json"
+
+DEFAULT_SETTINGS = {
+    "stock_data_path": "F:/inputs/stocks/",
+    "option_data_path": "F:/inputs/options/log",
+    "tickers": ["SPY"]
+}
+
+
+@functools.cache
+def _settings():
+    """Load settings.json once, falling back to defaults if it is missing."""
+    if not settings_path.is_file():
+        print(f"Settings file not found at {settings_path}, using defaults")
+        return dict(DEFAULT_SETTINGS)
+    return read_json(settings_path)
+
+
+def ensure_settings():
+    """Write the default settings.json if it does not exist yet."""
+    if settings_path.is_file():
+        return
     try:
-        with open(settings_path, "w") as f:
-            json.dump(settings, f, indent=2)
+        write_json(settings_path, DEFAULT_SETTINGS, indent=True)
         print(f"Created default settings file at {settings_path}")
     except Exception as e:
         print(f"Error creating settings file: {e}")
+    _settings.cache_clear()
+
+
+def _data_path(key):
+    path = _settings().get(key)
+    if not path:
+        raise ValueError("Stock or Option data paths missing in settings.json. Please fix.")
+    return path
 
-STOCK_PATH = settings.get("stock_data_path")
-OPTION_PATH = settings.get("option_data_path")
-TICKERS = settings.get("tickers", [])
 
-if not STOCK_PATH or not OPTION_PATH:
-    raise ValueError("Stock or Option data paths missing in settings.json. Please fix.")
+def stock_path():
+    return _data_path("stock_data_path")
+
+
+def option_path():
+    return _data_path("option_data_path")
+
+
+def tickers():
+    return _settings().get("tickers", [])
+
+# Numeric quotedata columns, typed up front so reads skip inference. The put
+# side repeats the call headers, which pandas suffixes with ".1"
+_QUOTEDATA_NUMERIC = ["Last Sale", "Net", "Bid", "Ask", "Volume", "IV", "Delta", "Gamma", "Open Interest"]
+_QUOTEDATA_DTYPE = {
+    "Strike": "float64",
+    "Strike Price": "float64",
+    **{name: "float64" for name in _QUOTEDATA_NUMERIC},
+    **{f"{name}.1": "float64" for name in _QUOTEDATA_NUMERIC}
+}
+
+# Part of each Parquet cache file name; bump it whenever _QUOTEDATA_DTYPE or
+# _STOCK_CONVERT_OPTIONS change so copies written under the old typing are
+# parsed again instead of reused
+PARQUET_CACHE_VERSION = 2
+
+if HAVE_PYARROW:
+    # Typed during parsing so callers need no to_datetime/to_numeric passes
+    _STOCK_CONVERT_OPTIONS = pa_csv.ConvertOptions(
+        column_types={
+            "Date": pa.timestamp("s"),
+            "Close/Last": pa.float64(),
+            "Volume": pa.int64()
+        },
+        timestamp_parsers=["%m/%d/%Y", pa_csv.ISO8601]
+    )
+
+
+def _read_stock_csv(filepath):
+    if HAVE_PYARROW:
+        try:
+            table = pa_csv.read_csv(filepath, convert_options=_STOCK_CONVERT_OPTIONS)
+            return table.to_pandas(self_destruct=True)
+        except pa.ArrowInvalid:
+            pass  # Values outside the fixed schema, fall back to inference
+    return pd.read_csv(filepath)
 
 
 def load_stock_data(ticker):
     ticker = ticker.upper()
-    filepath = os.path.join(STOCK_PATH, f"{ticker}.csv")
+    filepath = os.path.join(stock_path(), f"{ticker}.csv")
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"Stock CSV not found: {filepath}")
-    return pd.read_csv(filepath)
+    return _read_parquet_cached(filepath, _read_stock_csv)
+
+
+def _read_quotedata(filepath):
+    try:
+        return pd.read_csv(filepath, skiprows=3, dtype=_QUOTEDATA_DTYPE)
+    except (ValueError, TypeError):
+        # Non-numeric placeholders in a numeric column, fall back to inference
+        return pd.read_csv(filepath, skiprows=3)
+
+
+def _parquet_path(filepath):
+    """Path of the Parquet copy of filepath for the current cache version."""
+    return f"{os.path.splitext(filepath)[0]}.v{PARQUET_CACHE_VERSION}.parquet"
+
+
+def _cached_parquet_path(filepath):
+    """Return the Parquet copy of filepath if it is at least as new as the CSV."""
+    parquet_path = _parquet_path(filepath)
+    try:
+        if os.path.getmtime(parquet_path) >= os.path.getmtime(filepath):
+            return parquet_path
+    except OSError:
+        pass  # No cache yet
+    return None
+
+
+def _read_parquet_cached(filepath, read_csv, columns=None):
+    """Read a CSV through a Parquet copy stored next to it.
+
+    read_csv(filepath) parses the whole CSV when caching is off or the copy
+    is missing or older than the CSV; columns are applied to its result.
+    """
+    if not PARQUET_CACHE:
+        df = read_csv(filepath)
+        return df if columns is None else df[columns]
+    parquet_path = _cached_parquet_path(filepath)
+    if parquet_path is not None:
+        return pd.read_parquet(parquet_path, columns=columns, engine="pyarrow")
+    parquet_path = _parquet_path(filepath)
+    df = read_csv(filepath)
+    try:
+        df.to_parquet(parquet_path, compression="zstd", index=False)
+    except Exception as e:
+        print(f"Warning: Could not write Parquet cache {parquet_path}: {e}")
+    return df if columns is None else df[columns]
+
+
+def _iter_quotedata_chunks(filepaths, columns, chunksize):
+    """Yield quotedata chunks, streaming fresh Parquet copies batch by batch.
+
+    Files without a fresh copy are streamed from the CSV with inferred
+    dtypes and are not cached, since writing the copy needs the whole frame.
+    """
+    for filepath in filepaths:
+        parquet_path = _cached_parquet_path(filepath) if PARQUET_CACHE else None
+        if parquet_path is not None:
+            for batch in pq.ParquetFile(parquet_path).iter_batches(batch_size=chunksize, columns=columns):
+                yield batch.to_pandas()
+            continue
+        with pd.read_csv(filepath, skiprows=3, usecols=columns, chunksize=chunksize) as reader:
+            yield from reader
 
 
-def load_option_data(ticker, max_files=6):
+def load_option_data(ticker, max_files=6, columns=None, chunksize=None):
+    """
+    Load the most recent option chain CSVs for a ticker.
+
+    Pass columns to parse only those columns. Pass chunksize to get a
+    generator of DataFrames, newest file first, instead of one
+    concatenated frame.
+    """
     ticker_lower = ticker.lower()
-    base_dir = os.path.join(OPTION_PATH, ticker_lower)
+    base_dir = os.path.join(option_path(), ticker_lower)
 
     if not os.path.exists(base_dir):
         raise FileNotFoundError(f"Options directory not found: {base_dir}")
 
-    # List all date folders
-    date_folders = [d for d in os.listdir(base_dir) if os.path.isdir(os.path.join(base_dir, d))]
-
-    # Parse dates and sort
+    # Parse MM_DD_YYYY folder names into sortable (year, month, day) tuples
     def parse_date(d):
         try:
-            return datetime.strptime(d, "%m_%d_%Y")
+            month, day, year = d.split("_")
+            date = (int(year), int(month), int(day))
         except ValueError:
             return None
+        if len(year) != 4 or not (1 <= date[1] <= 12 and 1 <= date[2] <= 31):
+            return None
+        return date
 
-    date_folders = [(d, parse_date(d)) for d in date_folders]
+    # List all date folders; DirEntry.is_dir() avoids a stat per entry
+    with os.scandir(base_dir) as entries:
+        date_folders = [(e.name, parse_date(e.name)) for e in entries if e.is_dir()]
     date_folders = [d for d in date_folders if d[1] is not None]
     date_folders.sort(key=lambda x: x[1], reverse=True)
 
     selected_folders = date_folders[:max_files]
 
-    dataframes = []
+    filepaths = []
     for folder, _ in selected_folders:
         filepath = os.path.join(base_dir, folder, f"{ticker_lower}_quotedata.csv")
         if os.path.exists(filepath):
-            df = pd.read_csv(filepath, skiprows=3)
-            dataframes.append(df)
+            filepaths.append(filepath)
         else:
             print(f"Warning: Missing quotedata file in {folder}")
 
-    if not dataframes:
+    if not filepaths:
         raise FileNotFoundError(f"No quotedata CSVs found for {ticker}")
 
+    if chunksize is not None:
+        return _iter_quotedata_chunks(filepaths, columns, chunksize)
+
+    # Reads are I/O bound, so overlap them; map keeps newest-first order
+    with ThreadPoolExecutor(max_workers=min(len(filepaths), 8)) as executor:
+        dataframes = list(executor.map(lambda p: _read_parquet_cached(p, _read_quotedata, columns), filepaths))
+
     combined_df = pd.concat(dataframes, ignore_index=True)
     return combined_df
 
 
 def load_all_stock_data():
     data = {}
-    for ticker in TICKERS:
+    for ticker in tickers():
         try:
             data[ticker] = load_stock_data(ticker)
         except FileNotFoundError as e:
@@ -95,7 +241,7 @@ def load_all_stock_data():
 
 def load_all_option_data():
     data = {}
-    for ticker in TICKERS:
+    for ticker in tickers():
         try:
             data[ticker] = load_option_data(ticker)
         except FileNotFoundError as e:
@@ -104,6 +250,7 @@ def load_all_option_data():
 
 
 if __name__ == "__main__":
+    ensure_settings()
     stocks = load_all_stock_data()
     options = load_all_option_data()
     print("Stocks loaded:", list(stocks.keys()))
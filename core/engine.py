@@ -2,17 +2,33 @@
 Game engine module that manages the game state and mechanics.
 """
 
-from typing import Dict, List, Optional, Tuple
-import random
+from typing import Dict, List, Optional, Sequence, Tuple
 import asyncio
-import json
+import bisect
+import numpy as np
 from dataclasses import dataclass, field
 from pathlib import Path
 from .retail_agent import RetailAgent
 from .monkey_agent import MonkeyAgent
 from .profiles.profile_loader import profile_manager
 from .memory_logger import MemoryLogger
-from .market_data_loader import market_data
+from .market_data_loader import get_market_data
+from . import engine_kernels
+from .engine_kernels import simulate_batch
+from .json_io import read_json
+
+# Parsed portfolio.json, loaded once on first GameConfig construction
+_PORTFOLIO_CACHE: Optional[Dict] = None
+
+# Number of uniform rolls pre-drawn per RNG refill
+_RANDOM_BATCH = 1024
+
+def _load_portfolio() -> Dict:
+    """Load portfolio settings, reading portfolio.json only once."""
+    global _PORTFOLIO_CACHE
+    if _PORTFOLIO_CACHE is None:
+        _PORTFOLIO_CACHE = read_json(Path(__file__).parent / "data" / "portfolio.json")
+    return _PORTFOLIO_CACHE
 
 @dataclass
 class GameConfig:
@@ -30,18 +46,16 @@ class GameConfig:
     DEFAULT_SLINGSHOT: str = None
 
     def __post_init__(self):
-        # Load market data
-        market_state = market_data.get_market_state()
+        # Load market data; the snapshot is built once per process
+        market_state = get_market_data().get_market_state()
         self.SPOT_PRICE = market_state["price"]
         self.IMPLIED_VOL = market_state["implied_vol"]
         
         # Load portfolio settings
-        portfolio_path = Path(__file__).parent / "data" / "portfolio.json"
-        with open(portfolio_path, 'r') as f:
-            portfolio = json.load(f)
-            self.SLINGSHOTS = {s["name"]: s for s in portfolio["slingshots"]}
-            self.DEFAULT_SLINGSHOT = portfolio["default_slingshot"]
-            self.DTE = portfolio["market_settings"]["default_dte"]
+        portfolio = _load_portfolio()
+        self.SLINGSHOTS = {s["name"]: s for s in portfolio["slingshots"]}
+        self.DEFAULT_SLINGSHOT = portfolio["default_slingshot"]
+        self.DTE = portfolio["market_settings"]["default_dte"]
         
         # Generate strikes and gamma
         if self.STRIKES is None:
@@ -51,17 +65,13 @@ class GameConfig:
             gamma_profile = market_state.get("gamma_profile", {})
             if gamma_profile:
                 # Normalize gamma values
-                max_gamma = max(gamma_profile.values())
-                self.GAMMA_STRENGTH = {
-                    s: (gamma_profile.get(s, 0) / max_gamma) 
-                    for s in self.STRIKES
-                }
+                gamma = np.asarray([gamma_profile.get(s, 0) for s in self.STRIKES], dtype=np.float32)
+                gamma /= np.float32(max(gamma_profile.values()))
             else:
                 # Synthetic gamma profile
-                self.GAMMA_STRENGTH = {
-                    s: 0.2 + 0.02 * abs(s - self.SPOT_PRICE) 
-                    for s in self.STRIKES
-                }
+                strikes = np.asarray(self.STRIKES, dtype=np.float32)
+                gamma = 0.2 + 0.02 * np.abs(strikes - np.float32(self.SPOT_PRICE))
+            self.GAMMA_STRENGTH = dict(zip(self.STRIKES, gamma.tolist()))
 
 @dataclass
 class Coconut:
@@ -88,39 +98,170 @@ class Coconut:
             self.frames_remaining = self.slingshot["dte"] * 60
         self.option_type = self.slingshot["option_type"]
 
-    def update(self) -> None:
-        """Update coconut position and state."""
-        self.frames_remaining -= 1
-        if self.frames_remaining <= 0:
-            self.alive = False
-            return
+class CoconutPool:
+    """Struct-of-arrays storage for in-flight coconuts.
+
+    Live coconuts occupy rows ``[0, size)``; dead rows are compacted away at
+    the end of each frame so the columns stay dense.
+    """
+    _COLUMNS = (
+        "strike", "strike_idx", "x", "y", "target_x", "target_y", "t", "speed", "power",
+        "accuracy", "retail_juice", "mm_juice", "frames_remaining", "hit", "alive"
+    )
+
+    def __init__(self, capacity: int = 64):
+        self.size = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.strike = np.zeros(capacity, dtype=np.int64)
+        self.strike_idx = np.zeros(capacity, dtype=np.int64)  # Position in valid_strikes
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.target_x = np.zeros(capacity)
+        self.target_y = np.zeros(capacity)
+        self.t = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.power = np.zeros(capacity)
+        self.accuracy = np.zeros(capacity)
+        self.retail_juice = np.zeros(capacity)
+        self.mm_juice = np.zeros(capacity)
+        self.frames_remaining = np.zeros(capacity, dtype=np.int64)
+        self.hit = np.zeros(capacity, dtype=bool)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Per-row Python objects kept alongside the numeric columns
+        self.slingshots: List[Dict] = []
+        self.source_agents: List[str] = []
+
+    def _grow(self) -> None:
+        """Double capacity, preserving live rows."""
+        n = self.size
+        old = {name: getattr(self, name)[:n] for name in self._COLUMNS}
+        slingshots, source_agents = self.slingshots, self.source_agents
+        self._allocate(self.capacity * 2)
+        for name, column in old.items():
+            getattr(self, name)[:n] = column
+        self.slingshots, self.source_agents = slingshots, source_agents
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        """Yield a Coconut view for every live row."""
+        for i in range(self.size):
+            yield self.view(i)
+
+    def view(self, i: int) -> Coconut:
+        """Build a Coconut view of row ``i``."""
+        return Coconut(
+            strike=int(self.strike[i]),
+            x=float(self.x[i]),
+            y=float(self.y[i]),
+            target_x=float(self.target_x[i]),
+            target_y=float(self.target_y[i]),
+            slingshot=self.slingshots[i],
+            t=float(self.t[i]),
+            speed=float(self.speed[i]),
+            hit=bool(self.hit[i]),
+            retail_juice=float(self.retail_juice[i]),
+            mm_juice=float(self.mm_juice[i]),
+            source_agent=self.source_agents[i],
+            alive=bool(self.alive[i]),
+            frames_remaining=int(self.frames_remaining[i])
+        )
+
+    def append(self, coconut: Coconut, strike_idx: int) -> None:
+        """Write a coconut into the next free row."""
+        if self.size == self.capacity:
+            self._grow()
+        i = self.size
+        self.strike[i] = coconut.strike
+        self.strike_idx[i] = strike_idx
+        self.x[i] = coconut.x
+        self.y[i] = coconut.y
+        self.target_x[i] = coconut.target_x
+        self.target_y[i] = coconut.target_y
+        self.t[i] = coconut.t
+        self.speed[i] = coconut.speed
+        self.power[i] = coconut.slingshot["power"]
+        self.accuracy[i] = coconut.slingshot["accuracy"]
+        self.retail_juice[i] = coconut.retail_juice
+        self.mm_juice[i] = coconut.mm_juice
+        self.frames_remaining[i] = coconut.frames_remaining
+        self.hit[i] = coconut.hit
+        self.alive[i] = coconut.alive
+        self.slingshots.append(coconut.slingshot)
+        self.source_agents.append(coconut.source_agent)
+        self.size += 1
+
+    def update(self, rng: np.random.Generator) -> np.ndarray:
+        """Advance every live coconut one frame.
+
+        Args:
+            rng: Generator used for the per-coconut accuracy jitter
+
+        Returns:
+            np.ndarray: Indices of rows that died this frame
+        """
+        n = self.size
+        frames = self.frames_remaining[:n]
+        t = self.t[:n]
+        alive = self.alive[:n]
+
+        frames -= 1
+        alive &= frames > 0
+        t[alive] += self.speed[:n][alive] * self.power[:n][alive]
+        alive &= t < 1
+
+        # Enhanced arc path with slingshot accuracy
+        idx = np.flatnonzero(alive)
+        if idx.size:
+            ti = t[idx]
+            acc = self.accuracy[idx]
+            accuracy_factor = rng.uniform(acc, 2 - acc)
 
-        self.t += self.speed * self.slingshot["power"]
-        if self.t >= 1:
-            self.alive = False
-        else:
-            # Enhanced arc path with slingshot accuracy
-            accuracy_factor = random.uniform(
-                1 - (1 - self.slingshot["accuracy"]), 
-                1 + (1 - self.slingshot["accuracy"])
-            )
-            
             # Base path
-            base_x = (1 - self.t) * self.x + self.t * self.target_x
-            base_y = (1 - self.t) * self.y + self.t * self.target_y
-            
+            base_x = (1 - ti) * self.x[idx] + ti * self.target_x[idx]
+            base_y = (1 - ti) * self.y[idx] + ti * self.target_y[idx]
+
             # Add arc and accuracy variation
-            arc_height = 100 * self.slingshot["power"]
-            arc_offset = arc_height * self.t * (1 - self.t)
-            
-            self.x = base_x * accuracy_factor
-            self.y = base_y - arc_offset
+            arc_offset = 100 * self.power[idx] * ti * (1 - ti)
+
+            self.x[idx] = base_x * accuracy_factor
+            self.y[idx] = base_y - arc_offset
+
+        return np.flatnonzero(~alive)
+
+    def compact(self) -> None:
+        """Drop dead rows, keeping live coconuts in launch order."""
+        n = self.size
+        keep = np.flatnonzero(self.alive[:n])
+        if keep.size == n:
+            return
+        for name in self._COLUMNS:
+            column = getattr(self, name)
+            column[:keep.size] = column[keep]
+        self.slingshots = [self.slingshots[i] for i in keep]
+        self.source_agents = [self.source_agents[i] for i in keep]
+        self.size = int(keep.size)
+
+    def clear(self) -> None:
+        """Remove all coconuts."""
+        self.size = 0
+        self.slingshots = []
+        self.source_agents = []
 
 class GameEngine:
     """Manages game state and mechanics."""
-    def __init__(self, config: GameConfig):
+    def __init__(self, config: GameConfig, seed: Optional[int] = None):
         self.config = config
-        self.retail_agent = RetailAgent()
+
+        # Batched PCG64 random rolls for the simulation hot path
+        self._rng = np.random.default_rng(seed)
+        self._rand_pool = self._rng.random(_RANDOM_BATCH)
+        self._rand_idx = 0
+        self.retail_agent = RetailAgent(seed=seed)
         self.monkey_agent = MonkeyAgent()
         
         # Initialize memory loggers
@@ -129,10 +270,16 @@ class GameEngine:
         
         # Game state - ensure strikes are sorted for consistency
         self.valid_strikes = sorted(config.STRIKES)
-        self.tree_hits = {s: 0 for s in self.valid_strikes}
-        self.retail_juice = {s: 0 for s in self.valid_strikes}
-        self.mm_juice = {s: 0 for s in self.valid_strikes}
-        self.coconuts: List[Coconut] = []
+        self.strike_index = {s: i for i, s in enumerate(self.valid_strikes)}
+        
+        # Per-strike counters, indexed by position in valid_strikes
+        self.tree_hits = np.zeros(len(self.valid_strikes), dtype=np.int64)
+        self.retail_juice = np.zeros(len(self.valid_strikes))
+        self.mm_juice = np.zeros(len(self.valid_strikes))
+        # Running sums of the juice arrays, kept in step by _update_game_state
+        self.retail_total = 0.0
+        self.mm_total = 0.0
+        self.coconuts = CoconutPool()
         self.frame = 0
         self.paused = False
         self.ai_enabled = {"retail": True, "monkey": True}
@@ -146,6 +293,7 @@ class GameEngine:
             strike: start_x + i * spacing 
             for i, strike in enumerate(self.valid_strikes)
         }
+        self.tree_x = np.fromiter(self.TREE_X.values(), dtype=np.float64, count=len(self.TREE_X))
         self.TREE_Y = config.HEIGHT - 120
         
         # Available profiles
@@ -154,45 +302,104 @@ class GameEngine:
         
         # Current slingshot
         self.current_slingshot = self.config.SLINGSHOTS[self.config.DEFAULT_SLINGSHOT]
+        self._derive_slingshot_constants()
+        
+        # Shared game state handed to agents; arrays are live references
+        self._game_state_view = {
+            "strikes": self.valid_strikes,
+            "tree_hits": self.tree_hits,
+            "retail_juice": self.retail_juice,
+            "mm_juice": self.mm_juice
+        }
         
         # Initialize gamma profile
         if self.config.GAMMA_STRENGTH is None:
             self._initialize_gamma_profile()
+        self.gamma_strength = np.array(
+            [self.config.GAMMA_STRENGTH[s] for s in self.valid_strikes], dtype=np.float64
+        )
+        self._gamma_arr = self.gamma_strength.astype(np.float32)
             
     def _initialize_gamma_profile(self) -> None:
         """Initialize gamma profile with proper scaling."""
         spot_price = self.config.SPOT_PRICE
         
         # Get actual gamma profile if available
-        gamma_profile = market_data.get_gamma_profile()
+        gamma_profile = get_market_data().get_gamma_profile()
         
         if gamma_profile:
             # Normalize gamma values
             max_gamma = max(gamma_profile.values())
             if max_gamma > 0:
-                self.config.GAMMA_STRENGTH = {
-                    s: (gamma_profile.get(s, 0) / max_gamma) 
-                    for s in self.valid_strikes
-                }
+                gamma = np.asarray(
+                    [gamma_profile.get(s, 0) for s in self.valid_strikes], dtype=np.float32
+                )
+                gamma /= np.float32(max_gamma)
+                self.config.GAMMA_STRENGTH = dict(zip(self.valid_strikes, gamma.tolist()))
                 print(f"Using actual gamma profile: {self.config.GAMMA_STRENGTH}")
                 return
         
         # Generate synthetic gamma profile
         # Higher gamma near spot price, decaying as we move away
-        self.config.GAMMA_STRENGTH = {}
-        for strike in self.valid_strikes:
-            distance = abs(strike - spot_price)
-            # Exponential decay with distance
-            gamma = 1.0 * pow(0.9, distance)
-            self.config.GAMMA_STRENGTH[strike] = gamma
+        distance = np.abs(np.asarray(self.valid_strikes, dtype=np.float32) - np.float32(spot_price))
+        # Exponential decay with distance
+        gamma = np.power(np.float32(0.9), distance)
+        self.config.GAMMA_STRENGTH = dict(zip(self.valid_strikes, gamma.tolist()))
             
         print(f"Using synthetic gamma profile around {spot_price}")
         
+    def warmup_jit(self) -> None:
+        """Compile the numba kernels now rather than on the first frame."""
+        engine_kernels.warmup()
+
+    def _derive_slingshot_constants(self) -> None:
+        """Precompute the hit-chance factors that only depend on slingshot and IV."""
+        slingshot = self.current_slingshot
+        wind_penalty = self.config.IMPLIED_VOL / 100
+        decay_penalty = max(0.1, slingshot["dte"] / 30)
+        accuracy_bonus = slingshot["accuracy"] * 0.2
+        power_factor = slingshot["power"] * 0.1
+        self._slingshot_derived = {
+            "implied_vol": self.config.IMPLIED_VOL,
+            "const_mul": (
+                (1 - wind_penalty) *
+                (1 / decay_penalty) *
+                (1 + accuracy_bonus) *
+                (1 + power_factor)
+            ),
+            # Calls favour spot above strike, puts favour spot below
+            "call_sign": 1 if slingshot["option_type"] == "call" else -1
+        }
+
+    def _current_slingshot_constants(self) -> Dict:
+        """Get the derived slingshot constants, rebuilding them if IV moved."""
+        if self._slingshot_derived["implied_vol"] != self.config.IMPLIED_VOL:
+            self._derive_slingshot_constants()
+        return self._slingshot_derived
+
+    def _random(self) -> float:
+        """Pop one uniform [0, 1) roll, refilling the batch when exhausted."""
+        if self._rand_idx == _RANDOM_BATCH:
+            self._rand_pool = self._rng.random(_RANDOM_BATCH)
+            self._rand_idx = 0
+        roll = self._rand_pool[self._rand_idx]
+        self._rand_idx += 1
+        return float(roll)
+
     def _get_valid_strike(self, strike: int) -> int:
         """Get nearest valid strike price."""
-        if strike not in self.valid_strikes:
-            strike = min(self.valid_strikes, key=lambda x: abs(x - strike))
-            print(f"Adjusted strike {strike} to nearest valid strike")
+        if strike in self.strike_index:
+            return strike
+        # valid_strikes is sorted, so the nearest strike is one of the bisect neighbours
+        i = bisect.bisect_left(self.valid_strikes, strike)
+        if i == 0:
+            strike = self.valid_strikes[0]
+        elif i == len(self.valid_strikes):
+            strike = self.valid_strikes[-1]
+        else:
+            lo, hi = self.valid_strikes[i - 1], self.valid_strikes[i]
+            strike = hi if (hi - strike) < (strike - lo) else lo
+        print(f"Adjusted strike {strike} to nearest valid strike")
         return strike
 
     def _get_tree_position(self, strike: int) -> Tuple[float, float]:
@@ -200,117 +407,183 @@ class GameEngine:
         strike = self._get_valid_strike(strike)
         return self.TREE_X[strike], self.TREE_Y
 
-    def _update_game_state(self, strike: int, hit: bool, retail: float, mm: float) -> None:
-        """Update game state with validated strike."""
-        valid_strike = self._get_valid_strike(strike)
-        if hit:
-            self.tree_hits[valid_strike] += 1
-            self.retail_juice[valid_strike] += retail
-            self.mm_juice[valid_strike] += mm
+    def _update_game_state(self, rows: np.ndarray) -> None:
+        """Credit hits from the given coconut pool rows to their strikes."""
+        pool = self.coconuts
+        hit_rows = rows[pool.hit[rows]]
+        if hit_rows.size:
+            idx = pool.strike_idx[hit_rows]
+            np.add.at(self.tree_hits, idx, 1)
+            retail = pool.retail_juice[hit_rows]
+            mm = pool.mm_juice[hit_rows]
+            np.add.at(self.retail_juice, idx, retail)
+            np.add.at(self.mm_juice, idx, mm)
+            self.retail_total += float(retail.sum())
+            self.mm_total += float(mm.sum())
+
+    def per_strike(self, values: np.ndarray) -> Dict[int, float]:
+        """Map a strike-indexed array back to a {strike: value} dict."""
+        return dict(zip(self.valid_strikes, values.tolist()))
 
     def get_game_state(self) -> Dict:
-        """Get current game state for agents."""
-        return {
-            "spot_price": self.config.SPOT_PRICE,
-            "strikes": self.valid_strikes,
-            "tree_hits": self.tree_hits,
-            "retail_juice": self.retail_juice,
-            "mm_juice": self.mm_juice,
-            "frame": self.frame,
-            "current_slingshot": self.current_slingshot["name"],
-            "option_type": self.current_slingshot["option_type"]
-        }
+        """
+        Get current game state for agents.
+        
+        The same dict is returned on every call with its scalar fields
+        refreshed. Agents may add their own metric keys, but must not
+        modify the per-strike arrays.
+        """
+        state = self._game_state_view
+        state["spot_price"] = self.config.SPOT_PRICE
+        state["frame"] = self.frame
+        state["current_slingshot"] = self.current_slingshot["name"]
+        state["option_type"] = self.current_slingshot["option_type"]
+        return state
 
     async def simulate_slingshot_hit(self, spot_price: float, strike_price: int) -> Tuple[bool, float, float]:
         """Simulate if a coconut hits and calculate juice distribution."""
-        # Validate strike price
-        if strike_price not in self.valid_strikes:
-            print(f"Warning: Strike {strike_price} out of valid range {min(self.valid_strikes)}-{max(self.valid_strikes)}")
-            strike_price = self._get_valid_strike(strike_price)
+        return self.simulate_slingshot_hit_sync(spot_price, strike_price)
+
+    def simulate_slingshot_hit_sync(self, spot_price: float, strike_price: int) -> Tuple[bool, float, float]:
+        """Synchronous simulate_slingshot_hit."""
+        hits, retail, mm = self.simulate_slingshot_batch_sync(spot_price, [strike_price])
+        return bool(hits[0]), float(retail[0]), float(mm[0])
 
-        delta_distance = abs(spot_price - strike_price)
-        base_hit_chance = 1.0 / (1 + delta_distance)
+    async def simulate_slingshot_batch(self, spot_price: float,
+                                       strike_prices: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Async wrapper around simulate_slingshot_batch_sync."""
+        return self.simulate_slingshot_batch_sync(spot_price, strike_prices)
+
+    def simulate_slingshot_batch_sync(self, spot_price: float,
+                                      strike_prices: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Simulate several coconuts against one monkey defense prediction.
+        
+        Args:
+            spot_price: Current spot price
+            strike_prices: Target strike per coconut
+            
+        Returns:
+            Tuple of (hits, retail_juice, mm_juice) arrays, one entry per coconut
+        """
+        # Validate strike prices, resolving each to its array index once
+        strikes = []
+        strike_idx = []
+        for strike_price in strike_prices:
+            idx = self.strike_index.get(strike_price)
+            if idx is None:
+                print(f"Warning: Strike {strike_price} out of valid range {min(self.valid_strikes)}-{max(self.valid_strikes)}")
+                strike_price = self._get_valid_strike(strike_price)
+                idx = self.strike_index[strike_price]
+            strikes.append(strike_price)
+            strike_idx.append(idx)
+        strike_arr = np.asarray(strikes, dtype=np.float64)
+        defended = np.zeros(len(strikes), dtype=bool)
+        option_type = self.current_slingshot['option_type']
         
-        # Get monkey defense prediction
+        # Get monkey defense prediction once for the whole batch
         if self.ai_enabled["monkey"]:
-            predictions = await self.monkey_agent.predict_targets(self.get_game_state())
-            defense_strikes = [p[0] for p in predictions]
-            if strike_price in defense_strikes:
-                base_hit_chance *= 0.5  # Reduce hit chance if monkey predicted the strike
+            predictions = self.monkey_agent.predict_targets_sync(self.get_game_state())
+            defended = np.isin(strike_arr, [p[0] for p in predictions])
+            for i in np.flatnonzero(defended):
+                # Hit chance is halved when the monkey predicted the strike
+                base_hit_chance = 0.5 / (1 + abs(spot_price - strikes[i]))
                 
                 # Record defense result based on final hit chance
-                defense_success = random.random() > base_hit_chance
+                defense_success = self._random() > base_hit_chance
                 self.monkey_agent.record_defense_result(defense_success)
                 
                 # Add memory
                 if defense_success:
                     self.monkey_memory.add_memory(
-                        f"Successfully defended {self.current_slingshot['option_type']} strike {strike_price}",
+                        f"Successfully defended {option_type} strike {strikes[i]}",
                         0.8
                     )
                 else:
                     self.monkey_memory.add_memory(
-                        f"Failed to defend {self.current_slingshot['option_type']} strike {strike_price}",
+                        f"Failed to defend {option_type} strike {strikes[i]}",
                         0.6
                     )
         
-        # Apply modifiers
-        wind_penalty = self.config.IMPLIED_VOL / 100
-        gamma_penalty = self.config.GAMMA_STRENGTH[strike_price] / 10
-        decay_penalty = max(0.1, self.current_slingshot["dte"] / 30)
-        
-        # Apply slingshot properties
-        accuracy_bonus = self.current_slingshot["accuracy"] * 0.2
-        power_factor = self.current_slingshot["power"] * 0.1
+        derived = self._current_slingshot_constants()
+        rolls = np.array([self._random() for _ in strikes])
+        hits, retail_juice, mm_juice = simulate_batch(
+            float(spot_price),
+            strike_arr,
+            self._gamma_arr[strike_idx],
+            defended,
+            derived["const_mul"],
+            derived["call_sign"],
+            rolls
+        )
         
-        # Option type modifier
-        if self.current_slingshot["option_type"] == "call":
-            # Calls are more effective when price is rising
-            option_mod = 1.1 if spot_price > strike_price else 0.9
-        else:
-            # Puts are more effective when price is falling
-            option_mod = 1.1 if spot_price < strike_price else 0.9
+        # Record retail hit results and memories
+        for strike_price, hit in zip(strikes, hits.tolist()):
+            self.retail_agent.record_hit(hit)
+            if hit:
+                self.retail_memory.add_memory(
+                    f"Hit {option_type} strike {strike_price} at spot {spot_price}",
+                    0.7
+                )
+            else:
+                self.retail_memory.add_memory(
+                    f"Missed {option_type} strike {strike_price}",
+                    0.5
+                )
         
-        final_hit_chance = (
-            base_hit_chance * 
-            (1 - wind_penalty) * 
-            (1 - gamma_penalty) * 
-            (1 / decay_penalty) *
-            (1 + accuracy_bonus) *
-            (1 + power_factor) *
-            option_mod
-        )
-        final_hit_chance = max(0, min(final_hit_chance, 1))
+        return hits, retail_juice, mm_juice
+
+    def run_trials(self, trials: Optional[int] = None,
+                   defense_strikes: Sequence[int] = ()) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Monte-carlo sweep of the current slingshot against every valid strike.
         
-        hit = random.random() < final_hit_chance
-        mm_juice = 0.7 if hit else 0
-        retail_juice = 1 - mm_juice if hit else 0
+        Agents and memories are not consulted; this only exercises the hit model.
         
-        # Record retail hit result and memory
-        self.retail_agent.record_hit(hit)
-        if hit:
-            self.retail_memory.add_memory(
-                f"Hit {self.current_slingshot['option_type']} strike {strike_price} at spot {spot_price}",
-                0.7
-            )
-        else:
-            self.retail_memory.add_memory(
-                f"Missed {self.current_slingshot['option_type']} strike {strike_price}",
-                0.5
-            )
+        Args:
+            trials: Shots per strike, defaults to config.TRIALS
+            defense_strikes: Strikes treated as defended by the monkey
+            
+        Returns:
+            Tuple of (hits, retail_juice, mm_juice) totals aligned with valid_strikes
+        """
+        if trials is None:
+            trials = self.config.TRIALS
+        derived = self._current_slingshot_constants()
         
-        return hit, retail_juice, mm_juice
+        n = len(self.valid_strikes)
+        strikes = np.asarray(self.valid_strikes, dtype=np.float64)
+        defended = np.isin(strikes, np.asarray(defense_strikes, dtype=np.float64))
+        hits, retail, mm = simulate_batch(
+            float(self.config.SPOT_PRICE),
+            np.tile(strikes, trials),
+            np.tile(self._gamma_arr, trials),
+            np.tile(defended, trials),
+            derived["const_mul"],
+            derived["call_sign"],
+            self._rng.random(n * trials)
+        )
+        return (
+            hits.reshape(trials, n).sum(axis=0),
+            retail.reshape(trials, n).sum(axis=0),
+            mm.reshape(trials, n).sum(axis=0)
+        )
 
     async def launch_coconut(self) -> Optional[Coconut]:
         """Launch a new coconut, using retail agent if enabled."""
+        return self.launch_coconut_sync()
+
+    def launch_coconut_sync(self) -> Optional[Coconut]:
+        """Synchronous launch_coconut."""
         if self.frame >= self.config.TRIALS:
             return None
             
         if self.ai_enabled["retail"]:
             # Get valid targets for current slingshot
-            targets = market_data.get_slingshot_targets(
+            targets = get_market_data().get_slingshot_targets(
                 self.current_slingshot["name"],
-                self.config.SPOT_PRICE
+                self.config.SPOT_PRICE,
+                limit=1
             )
             
             if targets:
@@ -320,17 +593,17 @@ class GameEngine:
                 confidence = target_data["attractiveness"]
             else:
                 # Fallback to agent selection with valid strike range
-                target, confidence = await self.retail_agent.select_target(self.get_game_state())
+                target, confidence = self.retail_agent.select_target_sync(self.get_game_state())
                 # Ensure target is within valid range
                 target = self._get_valid_strike(target)
         else:
-            target = random.choice(self.valid_strikes)  # Always choose from valid strikes
+            target = self.valid_strikes[int(self._random() * len(self.valid_strikes))]  # Always choose from valid strikes
             confidence = 1.0
             
         if target is None:
             return None
             
-        hit, retail, mm = await self.simulate_slingshot_hit(self.config.SPOT_PRICE, target)
+        hit, retail, mm = self.simulate_slingshot_hit_sync(self.config.SPOT_PRICE, target)
         
         # Get tree position for target
         tree_x, tree_y = self._get_tree_position(target)
@@ -341,7 +614,7 @@ class GameEngine:
             y=0,
             target_x=tree_x + 10,  # Add offset for better targeting
             target_y=tree_y,
-            speed=random.uniform(0.01, 0.03),
+            speed=0.01 + 0.02 * self._random(),
             hit=hit,
             retail_juice=retail,
             mm_juice=mm,
@@ -355,32 +628,33 @@ class GameEngine:
         """Switch to a different slingshot."""
         if slingshot_name in self.config.SLINGSHOTS:
             self.current_slingshot = self.config.SLINGSHOTS[slingshot_name]
+            self._derive_slingshot_constants()
             return True
         return False
 
     async def update(self) -> None:
         """Update game state for one frame."""
+        self.update_sync()
+
+    def update_sync(self) -> None:
+        """
+        Update game state for one frame without going through the event loop.
+        
+        Nothing in a frame update does I/O, so game loops call this directly;
+        the async methods are thin wrappers kept for existing callers.
+        """
         if self.paused:
             return
             
         # Launch new coconut
-        coconut = await self.launch_coconut()
+        coconut = self.launch_coconut_sync()
         if coconut:
-            self.coconuts.append(coconut)
+            self.coconuts.append(coconut, self.strike_index[self._get_valid_strike(coconut.strike)])
             self.frame += 1
             
-        # Update existing coconuts
-        for coconut in self.coconuts[:]:
-            coconut.update()
-            if not coconut.alive:
-                # Update game state with validated strike
-                self._update_game_state(
-                    coconut.strike,
-                    coconut.hit,
-                    coconut.retail_juice,
-                    coconut.mm_juice
-                )
-                self.coconuts.remove(coconut)
+        # Update existing coconuts, crediting and dropping the ones that landed
+        self._update_game_state(self.coconuts.update(self._rng))
+        self.coconuts.compact()
 
     def toggle_pause(self) -> None:
         """Toggle game pause state."""
@@ -401,8 +675,10 @@ class GameEngine:
 
     def reset(self) -> None:
         """Reset game state."""
-        self.tree_hits = {s: 0 for s in self.valid_strikes}
-        self.retail_juice = {s: 0 for s in self.valid_strikes}
-        self.mm_juice = {s: 0 for s in self.valid_strikes}
-        self.coconuts = []
+        self.tree_hits.fill(0)
+        self.retail_juice.fill(0)
+        self.mm_juice.fill(0)
+        self.retail_total = 0.0
+        self.mm_total = 0.0
+        self.coconuts.clear()
         self.frame = 0 
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+Numeric kernels for the slingshot simulation.
+
+Kernels are compiled with numba when it is installed and run as plain
+Python otherwise.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    def njit(*args, **kwargs):
+        """Fallback decorator that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+@njit(cache=True)
+def final_hit_chance(spot: float, strike: float, gamma: float, defended: bool,
+                     const_mul: float, call_sign: int) -> float:
+    """Hit probability for one coconut, clamped to [0, 1]."""
+    base_hit_chance = 1.0 / (1.0 + abs(spot - strike))
+    if defended:
+        base_hit_chance *= 0.5
+    gamma_penalty = gamma / 10
+    # 1.1 when the move favours the option type, else 0.9
+    option_mod = 0.9 + 0.2 * ((spot - strike) * call_sign > 0)
+    chance = base_hit_chance * const_mul * (1.0 - gamma_penalty) * option_mod
+    return min(max(chance, 0.0), 1.0)
+
+@njit(cache=True)
+def simulate_batch(spot, strikes, gamma, defense_mask, const_mul, call_sign, rolls):
+    """
+    Simulate a batch of slingshot shots.
+    
+    Args:
+        spot: Spot price
+        strikes: Target strike per shot
+        gamma: Normalized gamma strength per shot
+        defense_mask: True where the monkey defends the shot's strike
+        const_mul: Slingshot/IV multiplier from GameEngine
+        call_sign: +1 for calls, -1 for puts
+        rolls: Uniform [0, 1) roll per shot
+        
+    Returns:
+        Tuple of (hits, retail_juice, mm_juice) arrays, one entry per shot
+    """
+    n = strikes.shape[0]
+    hits = np.zeros(n, dtype=np.bool_)
+    retail_juice = np.zeros(n)
+    mm_juice = np.zeros(n)
+    for i in range(n):
+        chance = final_hit_chance(spot, strikes[i], gamma[i], defense_mask[i],
+                                  const_mul, call_sign)
+        if rolls[i] < chance:
+            hits[i] = True
+            mm_juice[i] = 0.7
+            retail_juice[i] = 1 - 0.7
+    return hits, retail_juice, mm_juice
+
+@njit(cache=True)
+def retail_scores(strikes, spot, mm_juice, crowd, history, w_spot, w_history, w_mm, w_crowd, boost):
+    """
+    Score every strike for RetailAgent and pick the best one.
+    
+    Args:
+        strikes: Strike prices
+        spot: Spot price
+        mm_juice: Market maker juice per strike
+        crowd: Crowd size per strike
+        history: True where the strike was recently targeted
+        w_spot, w_history, w_mm, w_crowd: Profile weights
+        boost: Index whose score is scaled by 1.5 (FOMO), or -1
+        
+    Returns:
+        Tuple of (index, score) of the highest-scoring strike, with the score
+        capped at 1.0 for use as a confidence; ties keep the first
+    """
+    best = -1
+    best_score = -np.inf
+    for i in range(strikes.shape[0]):
+        score = (1.0 / (1 + abs(strikes[i] - spot)/5)) * w_spot
+        score += (1.0 if history[i] else 0.0) * w_history
+        score += (1.0 - mm_juice[i]) * w_mm
+        score += min(1.0, crowd[i] / 5) * w_crowd
+        if i == boost:
+            score *= 1.5
+        if score > best_score:
+            best = i
+            best_score = score
+    return best, min(best_score, 1.0)
+
+def warmup() -> None:
+    """
+    Compile the kernels ahead of the first frame.
+    
+    Calls each kernel once on one-element arrays of the dtypes the engine and
+    agents pass, so numba compiles (or loads from its cache) the signatures
+    used at runtime. Without numba this is just two cheap calls.
+    """
+    strikes = np.zeros(1)
+    flags = np.zeros(1, dtype=np.bool_)
+    simulate_batch(0.0, strikes, np.zeros(1, dtype=np.float32), flags, 1.0, 1, np.zeros(1))
+    retail_scores(strikes, 0.0, np.zeros(1), np.zeros(1, dtype=np.int32), flags,
+                  0.0, 0.0, 0.0, 0.0, -1)
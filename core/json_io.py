@@ -0,0 +1,68 @@
+"""
+JSON file helpers that use orjson when it is installed.
+
+Paths ending in ``.zst`` are zstd-compressed, which needs zstandard.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional
+    zstandard = None
+
+# Suffix for compressed JSON files, or "" when zstandard is not installed
+ZSTD_SUFFIX = ".zst" if zstandard is not None else ""
+
+def _default(obj: Any) -> Any:
+    """Serialize numpy scalars and arrays for the stdlib fallback."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON document."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, optionally with 2-space indent."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, default=_default).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), default=_default).encode("utf-8")
+
+def _is_compressed(path: Path) -> bool:
+    if path.suffix != ".zst":
+        return False
+    if zstandard is None:
+        raise ImportError(f"zstandard is required to read or write {path}")
+    return True
+
+def read_json(path: Union[str, Path]) -> Any:
+    """Read and parse a JSON file."""
+    path = Path(path)
+    data = path.read_bytes()
+    if _is_compressed(path):
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return loads(data)
+
+def write_json(path: Union[str, Path], obj: Any, indent: bool = False) -> None:
+    """Serialize obj and write it to a JSON file."""
+    path = Path(path)
+    data = dumps(obj, indent=indent)
+    if _is_compressed(path):
+        data = zstandard.ZstdCompressor(level=3).compress(data)
+    path.write_bytes(data)
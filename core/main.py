@@ -8,6 +8,9 @@ from engine import GameEngine, GameConfig
 from ui import GameUI
 from market_data import market_data
 
+# Frames between market data freshness checks
+REFRESH_CHECK_FRAMES = 60
+
 async def main(config: GameConfig = None):
     """Initialize and run the game."""
     # Initialize game components
@@ -16,23 +19,20 @@ async def main(config: GameConfig = None):
         config = GameConfig()
     
     engine = GameEngine(config)
+    engine.warmup_jit()
     ui = GameUI(engine)
     
-    # Set up market data refresh task
+    # One-shot market data refresh, started only when the cache has expired
     async def refresh_market_data():
-        while True:
-            try:
-                # Update market data every 5 minutes
-                market_state = await market_data.get_market_data()
-                engine.config.SPOT_PRICE = market_state["price"]
-                engine.config.IMPLIED_VOL = market_state["implied_vol"]
-                await asyncio.sleep(300)  # 5 minutes
-            except Exception as e:
-                print(f"Error refreshing market data: {e}")
-                await asyncio.sleep(60)  # Retry after 1 minute
+        try:
+            market_state = await market_data.get_market_data()
+            engine.config.SPOT_PRICE = market_state["price"]
+            engine.config.IMPLIED_VOL = market_state["implied_vol"]
+        except Exception as e:
+            print(f"Error refreshing market data: {e}")
     
-    # Start market data refresh task
-    refresh_task = asyncio.create_task(refresh_market_data())
+    refresh_task = None
+    frames = 0
     
     # Main game loop
     running = True
@@ -40,14 +40,26 @@ async def main(config: GameConfig = None):
         # Handle events
         running = ui.handle_events()
         
-        # Update game state
-        await engine.update()
+        # Fetch in the background so a slow API call never stalls a frame
+        if (frames % REFRESH_CHECK_FRAMES == 0 and
+                (refresh_task is None or refresh_task.done()) and
+                market_data.is_stale()):
+            refresh_task = asyncio.create_task(refresh_market_data())
+        frames += 1
+        
+        # Update game state; the frame update never awaits, so yield to the
+        # event loop only while a refresh is in flight
+        engine.update_sync()
+        if refresh_task is not None and not refresh_task.done():
+            await asyncio.sleep(0)
         
         # Render frame
         ui.draw()
     
     # Cleanup
-    refresh_task.cancel()
+    if refresh_task is not None:
+        refresh_task.cancel()
+    await market_data.close()
     ui.cleanup()
 
 if __name__ == "__main__":
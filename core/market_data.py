@@ -13,18 +13,20 @@ Requirements:
 - aiohttp for async API calls
 """
 
-import json
 import aiohttp
 import asyncio
+import random
+import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List, Tuple
 import os
 from pathlib import Path
+from .json_io import read_json, write_json
 
 class MarketData:
     """Handles fetching and caching of market data."""
     
-    def __init__(self):
+    def __init__(self, seed: int = 0):
         self.cache_dir = Path("data/cache")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.cache_file = self.cache_dir / "spy_cache.json"
@@ -38,6 +40,17 @@ class MarketData:
         self.cache_duration = timedelta(minutes=5)
         self.last_update: Optional[datetime] = None
         self.cached_data: Dict = {}
+        
+        # Seed for the synthetic price history noise
+        self.seed = seed
+        
+        # Exponential backoff after failed fetches
+        self.max_backoff = timedelta(hours=1)
+        self._failures = 0
+        self._retry_at: Optional[datetime] = None
+        
+        # HTTP session, created lazily inside the running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
 
     async def _fetch_spy_data(self) -> Dict:
         """Fetch SPY data from a free API."""
@@ -46,22 +59,48 @@ class MarketData:
             api_key = os.getenv("ALPHA_VANTAGE_KEY", "demo")
             url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol=SPY&apikey={api_key}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if "Global Quote" in data:
-                            quote = data["Global Quote"]
-                            return {
-                                "price": float(quote.get("05. price", self.default_price)),
-                                "volume": int(quote.get("06. volume", 0)),
-                                "timestamp": datetime.now().isoformat()
-                            }
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+            async with self._session.get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if "Global Quote" in data:
+                        quote = data["Global Quote"]
+                        self._failures = 0
+                        self._retry_at = None
+                        return {
+                            "price": float(quote.get("05. price", self.default_price)),
+                            "volume": int(quote.get("06. volume", 0)),
+                            "timestamp": datetime.now().isoformat()
+                        }
+            self._schedule_retry()
             return self._get_default_data()
         except Exception as e:
             print(f"Error fetching SPY data: {e}")
+            self._schedule_retry()
             return self._get_default_data()
 
+    def _schedule_retry(self) -> None:
+        """Back off exponentially, with jitter, after a failed fetch."""
+        self._failures += 1
+        delay = min(self.cache_duration * 2 ** (self._failures - 1), self.max_backoff)
+        self._retry_at = datetime.now() + delay * random.uniform(0.5, 1.5)
+
+    def is_stale(self) -> bool:
+        """Check whether get_market_data() would fetch new data right now."""
+        now = datetime.now()
+        if self._retry_at is not None and now < self._retry_at:
+            return False
+        return (not self.cached_data or
+                not self.last_update or
+                (now - self.last_update) > self.cache_duration)
+
+    async def close(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
     def _get_default_data(self) -> Dict:
         """Get default market data."""
         return {
@@ -75,11 +114,10 @@ class MarketData:
         """Load cached market data."""
         try:
             if self.cache_file.exists():
-                with open(self.cache_file, 'r') as f:
-                    data = json.load(f)
-                    if data.get("timestamp"):
-                        self.last_update = datetime.fromisoformat(data["timestamp"])
-                    return data
+                data = read_json(self.cache_file)
+                if data.get("timestamp"):
+                    self.last_update = datetime.fromisoformat(data["timestamp"])
+                return data
         except Exception as e:
             print(f"Error loading cache: {e}")
         return self._get_default_data()
@@ -87,8 +125,7 @@ class MarketData:
     def _save_cache(self, data: Dict) -> None:
         """Save market data to cache."""
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(data, f)
+            write_json(self.cache_file, data)
         except Exception as e:
             print(f"Error saving cache: {e}")
 
@@ -112,10 +149,7 @@ class MarketData:
         now = datetime.now()
         
         # Check if we need to refresh the data
-        if (not self.cached_data or 
-            force_refresh or 
-            not self.last_update or 
-            (now - self.last_update) > self.cache_duration):
+        if force_refresh or self.is_stale():
             
             # Fetch new data
             new_data = await self._fetch_spy_data()
@@ -141,16 +175,18 @@ class MarketData:
         """Get historical price data (simplified version)."""
         # In a real implementation, you'd fetch this from an API
         # For now, we'll generate synthetic data
-        history = []
         base_price = self.cached_data.get("price", self.default_price)
         
-        for i in range(lookback_days):
-            date = (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d")
-            # Add some random variation
-            price = base_price * (1 + (hash(date) % 100 - 50) / 1000)
-            history.append((date, price))
-            
-        return list(reversed(history))
+        # Oldest to newest, ending today
+        today = np.datetime64(datetime.now().date(), "D")
+        dates = np.arange(today - lookback_days + 1, today + 1).astype(str)
+        
+        # Add some random variation, drawn afresh from the seed so every call
+        # returns the same history
+        rng = np.random.default_rng(self.seed)
+        prices = base_price * (1 + rng.uniform(-0.05, 0.05, size=lookback_days))
+        
+        return list(zip(dates.tolist(), prices.tolist()))
 
 # Create global market data instance
 market_data = MarketData() 
\ No newline at end of file
@@ -2,12 +2,16 @@
 Market data loader that manages historical CSV data.
 """
 
-import json
 from datetime import datetime, timedelta
+from functools import cache, lru_cache
+from operator import itemgetter
+import heapq
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
+import numpy as np
 import pandas as pd
 from .data.data_loader import load_stock_data, load_option_data
+from .json_io import read_json
 
 class MarketDataLoader:
     """Handles loading and managing market data from CSV files."""
@@ -16,18 +20,19 @@ class MarketDataLoader:
         # Load portfolio settings
         self.portfolio_file = Path(__file__).parent / "data" / "portfolio.json"
         self.settings = self._load_portfolio_settings()
+        self.slingshots = {s["name"]: s for s in self.settings.get("slingshots", [])}
         
-        # Load historical data
+        # Load historical data; ATM IV is cached per rounded price
+        self._atm_iv_cache: Dict[float, Optional[float]] = {}
         self.historical_data = self._load_historical_data()
         
-        # Current market state
+        # Current market state, built once and kept for the process lifetime
         self.current_data = self._get_current_state()
 
     def _load_portfolio_settings(self) -> Dict:
         """Load settings from portfolio.json."""
         try:
-            with open(self.portfolio_file, 'r') as f:
-                return json.load(f)
+            return read_json(self.portfolio_file)
         except Exception as e:
             print(f"Error loading portfolio settings: {e}")
             return {
@@ -51,7 +56,8 @@ class MarketDataLoader:
             # Load stock data
             stock_data = load_stock_data(ticker)
             if "Date" in stock_data.columns:
-                stock_data["Date"] = pd.to_datetime(stock_data["Date"])
+                if not pd.api.types.is_datetime64_any_dtype(stock_data["Date"]):
+                    stock_data["Date"] = pd.to_datetime(stock_data["Date"])
                 stock_data.set_index("Date", inplace=True)
             stock_data = stock_data.sort_index(ascending=True)
             
@@ -60,6 +66,12 @@ class MarketDataLoader:
             print(f"Loaded stock price: {last_price}")
             last_volume = int(stock_data["Volume"].iloc[-1])
             
+            # Aggregates used by the IV fallback; the frame is fixed once loaded
+            stock_stats = {
+                "hist_vol": float(stock_data["Close/Last"].pct_change().std() * (252 ** 0.5) * 100),
+                "mean_volume": float(stock_data["Volume"].mean())
+            }
+            
             # Load options data
             try:
                 options_data = load_option_data(ticker)
@@ -87,11 +99,21 @@ class MarketDataLoader:
                         gamma_profile = {}
                         gamma_col = "Gamma" if "Gamma" in options_data.columns else "gamma"
                         if gamma_col in options_data.columns:
-                            for strike in strikes:
-                                strike_options = options_data[options_data[strike_col] == strike]
-                                if not strike_options.empty:
-                                    total_gamma = strike_options[gamma_col].sum()
-                                    gamma_profile[int(strike)] = float(total_gamma)
+                            # One hash-aggregate pass instead of a mask per strike
+                            gamma_series = options_data.groupby(strike_col, sort=False)[gamma_col].sum()
+                            gamma_series = gamma_series[gamma_series.index.isin(strikes)]
+                            gamma_profile = {int(k): float(v) for k, v in gamma_series.items()}
+                        
+                        # Contiguous copies of the columns the ATM IV lookup scans
+                        iv_col = "Implied Volatility" if "Implied Volatility" in options_data.columns else "IV"
+                        option_arrays = {
+                            "option_strikes": np.ascontiguousarray(
+                                options_data[strike_col].to_numpy(dtype=np.float64)
+                            ),
+                            "option_iv": np.ascontiguousarray(
+                                pd.to_numeric(options_data[iv_col], errors="coerce").to_numpy(dtype=np.float64)
+                            ) if iv_col in options_data.columns else None
+                        }
                         
                         print(f"Loaded options data: {len(options_data)} contracts")
                         print(f"Strike range: {min_strike}-{max_strike}")
@@ -100,8 +122,10 @@ class MarketDataLoader:
                         return {
                             "stock": stock_data,
                             "options": options_data,
+                            **option_arrays,
                             "last_price": last_price,
                             "last_volume": last_volume,
+                            **stock_stats,
                             "min_strike": int(min_strike),
                             "max_strike": int(max_strike),
                             "strikes": sorted([int(s) for s in strikes]),
@@ -118,6 +142,7 @@ class MarketDataLoader:
                 "stock": stock_data,
                 "last_price": last_price,
                 "last_volume": last_volume,
+                **stock_stats,
                 "min_strike": int(last_price - 15),
                 "max_strike": int(last_price + 15),
                 "strikes": list(strikes)
@@ -142,25 +167,16 @@ class MarketDataLoader:
         try:
             if "options" in self.historical_data:
                 # Use actual IV from options if available
-                options_data = self.historical_data["options"]
-                strike_col = "Strike Price" if "Strike Price" in options_data.columns else "Strike"
-                iv_col = "Implied Volatility" if "Implied Volatility" in options_data.columns else "IV"
-                
-                atm_options = options_data[
-                    (options_data[strike_col] > price * 0.95) & 
-                    (options_data[strike_col] < price * 1.05)
-                ]
-                if not atm_options.empty and iv_col in atm_options.columns:
-                    return float(atm_options[iv_col].mean())
+                atm_iv = self._atm_implied_vol(round(price, 2))
+                if atm_iv is not None:
+                    return atm_iv
             
             # Fallback to historical volatility calculation
             if "stock" in self.historical_data:
-                df = self.historical_data["stock"]
-                returns = df["Close/Last"].pct_change().dropna()
-                hist_vol = returns.std() * (252 ** 0.5) * 100
+                hist_vol = self.historical_data["hist_vol"]
                 
                 # Adjust for current volume
-                vol_ratio = volume / df["Volume"].mean() if volume > 0 else 1
+                vol_ratio = volume / self.historical_data["mean_volume"] if volume > 0 else 1
                 return hist_vol * vol_ratio
                 
         except Exception as e:
@@ -168,6 +184,21 @@ class MarketDataLoader:
             
         return self.settings["data_settings"]["fallback_vol"]
 
+    def _atm_implied_vol(self, price: float) -> Optional[float]:
+        """Mean IV of options within 5% of ``price``, cached per price."""
+        if price not in self._atm_iv_cache:
+            strikes = self.historical_data["option_strikes"]
+            iv = self.historical_data["option_iv"]
+            
+            atm_iv = None
+            atm = (strikes > price * 0.95) & (strikes < price * 1.05)
+            if iv is not None and atm.any():
+                atm_values = iv[atm]
+                atm_values = atm_values[~np.isnan(atm_values)]
+                atm_iv = float(atm_values.mean()) if atm_values.size else float("nan")
+            self._atm_iv_cache[price] = atm_iv
+        return self._atm_iv_cache[price]
+
     def _generate_strikes(self, spot_price: float) -> List[int]:
         """Generate strike prices based on available options data."""
         # Get min/max strikes from historical data or use default range
@@ -187,11 +218,14 @@ class MarketDataLoader:
             min_strike = int(center - 10)
             max_strike = int(center + 10)
             
-        # Generate strikes with consistent spacing
-        strikes = list(range(int(min_strike), int(max_strike) + 1))
-        
-        print(f"Generated strikes around {spot_price}: {min_strike}-{max_strike}")
-        return strikes
+        return list(self._strike_range(int(min_strike), int(max_strike)))
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _strike_range(min_strike: int, max_strike: int) -> Tuple[int, ...]:
+        """Generate strikes with consistent spacing, once per range."""
+        print(f"Generated strikes: {min_strike}-{max_strike}")
+        return tuple(range(min_strike, max_strike + 1))
 
     def get_gamma_profile(self) -> Dict[int, float]:
         """Get gamma profile for available strikes."""
@@ -215,32 +249,30 @@ class MarketDataLoader:
         """Get current market state."""
         return self.current_data
 
-    def get_slingshot_targets(self, slingshot_name: str, spot_price: float) -> List[Dict]:
-        """Get valid strike targets for a slingshot."""
-        slingshots = {s["name"]: s for s in self.settings["slingshots"]}
-        if slingshot_name not in slingshots:
+    def get_slingshot_targets(self, slingshot_name: str, spot_price: float,
+                              limit: Optional[int] = None) -> List[Dict]:
+        """Get valid strike targets for a slingshot, most attractive first.
+
+        When ``limit`` is given only that many top targets are returned.
+        """
+        if slingshot_name not in self.slingshots:
             return []
             
-        slingshot = slingshots[slingshot_name]
+        slingshot = self.slingshots[slingshot_name]
         strikes = self._generate_strikes(spot_price)
+        gamma_profile = self.historical_data.get("gamma_profile", {})
         
-        # Apply strike bias based on option type
-        bias = slingshot["strike_bias"]
-        base_strike = round(spot_price)
+        # Apply strike bias based on option type: calls use a positive
+        # bias to prefer higher strikes, puts a negative one for lower strikes
+        biased_strike = round(spot_price) + slingshot["strike_bias"]
         
         targets = []
         for strike in strikes:
             # Calculate strike's attractiveness based on bias and gamma
-            if slingshot["option_type"] == "call":
-                # For calls, positive bias prefers higher strikes
-                attractiveness = 1.0 / (1 + abs(strike - (base_strike + bias)))
-            else:
-                # For puts, negative bias prefers lower strikes
-                attractiveness = 1.0 / (1 + abs(strike - (base_strike + bias)))
+            attractiveness = 1.0 / (1 + abs(strike - biased_strike))
                 
             # Adjust attractiveness based on gamma if available
-            gamma = self.historical_data.get("gamma_profile", {}).get(strike, 0.1)
-            attractiveness *= (1 + gamma)
+            attractiveness *= (1 + gamma_profile.get(strike, 0.1))
                 
             if attractiveness > 0.3:  # Minimum attractiveness threshold
                 targets.append({
@@ -251,7 +283,9 @@ class MarketDataLoader:
                 })
                 
         # Sort by attractiveness
-        targets.sort(key=lambda x: x["attractiveness"], reverse=True)
+        if limit is not None:
+            return heapq.nlargest(limit, targets, key=itemgetter("attractiveness"))
+        targets.sort(key=itemgetter("attractiveness"), reverse=True)
         return targets
 
     def get_price_history(self, lookback_days: int = None) -> List[Tuple[str, float]]:
@@ -271,5 +305,7 @@ class MarketDataLoader:
         return [(datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d")
                 for i in range(lookback_days)]
 
-# Create global market data instance
-market_data = MarketDataLoader() 
\ No newline at end of file
+@cache
+def get_market_data() -> MarketDataLoader:
+    """Return the shared market data instance, loading it on first use."""
+    return MarketDataLoader() 
\ No newline at end of file
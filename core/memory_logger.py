@@ -2,21 +2,32 @@
 Memory logger module for managing agent memories and insights.
 """
 
-import json
+import atexit
 import os
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 import random
 
+import numpy as np
+
+from .json_io import read_json, write_json
+
 class Memory:
     """Represents a single memory entry."""
     def __init__(self, content: str, importance: float, timestamp: Optional[str] = None):
         self.content = content
         self.importance = importance
-        self.timestamp = timestamp or datetime.now().isoformat()
+        # Epoch seconds; the ISO form is only produced when asked for
+        self._ts = time.time() if timestamp is None else datetime.fromisoformat(timestamp).timestamp()
         self.references = 0  # How often this memory is accessed
         
+    @property
+    def timestamp(self) -> str:
+        """Creation time as an ISO 8601 string."""
+        return datetime.fromtimestamp(self._ts).isoformat()
+        
     def to_dict(self) -> Dict:
         """Convert memory to dictionary."""
         return {
@@ -38,18 +49,100 @@ class Memory:
         return memory
 
 class MemoryLogger:
-    """Manages agent memories and insights."""
+    """Manages agent memories and insights.
+
+    Memories are held as parallel columns (importance, references, timestamp
+    and content) so curation and relevance scoring run as array expressions.
+    ``memories`` builds ``Memory`` objects on demand for callers that want them.
+    """
+    
+    # Minimum seconds between writes of the memory file
+    SAVE_INTERVAL = 30.0
+    
+    # Importance is stored as float16 and read back rounded to this many decimals
+    IMPORTANCE_DECIMALS = 3
+    # Reference counts saturate here instead of overflowing their int16 column
+    MAX_REFERENCES = np.iinfo(np.int16).max
     
     def __init__(self, agent_name: str, max_memories: int = 100):
         self.agent_name = agent_name
         self.max_memories = max_memories
-        self.memories: List[Memory] = []
+        self.size = 0
+        self._allocate(max_memories + 1)
         self.logs_dir = Path("logs")
         self.logs_dir.mkdir(exist_ok=True)
+        self._dirty = False
+        self._last_save = 0.0
+        self._summary: Optional[str] = None
+        self._summary_rows: Optional[np.ndarray] = None  # Rows quoted in _summary
         
         # Load existing memories
         self._load_memories()
         
+        # Write out anything still pending when the process exits
+        atexit.register(self._flush)
+        
+    def _allocate(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._importance = np.zeros(capacity, dtype=np.float16)
+        self._references = np.zeros(capacity, dtype=np.int16)
+        self._ts_epoch = np.zeros(capacity, dtype=np.float64)
+        # Outcome keywords, matched once when the memory is stored
+        self._has_success = np.zeros(capacity, dtype=bool)
+        self._has_fail = np.zeros(capacity, dtype=bool)
+        self._content: List[str] = []
+        
+    def _grow(self, capacity: int) -> None:
+        """Reallocate to ``capacity``, preserving the stored rows."""
+        n = self.size
+        importance, references, ts_epoch = self._importance[:n], self._references[:n], self._ts_epoch[:n]
+        has_success, has_fail = self._has_success[:n], self._has_fail[:n]
+        content = self._content
+        self._allocate(capacity)
+        self._importance[:n] = importance
+        self._references[:n] = references
+        self._ts_epoch[:n] = ts_epoch
+        self._has_success[:n] = has_success
+        self._has_fail[:n] = has_fail
+        self._content = content
+        
+    def _append(self, content: str, importance: float, ts_epoch: float, references: int = 0) -> None:
+        """Write a memory into the next free row."""
+        if self.size == self.capacity:
+            self._grow(self.capacity * 2)
+        i = self.size
+        self._importance[i] = importance
+        self._references[i] = min(references, self.MAX_REFERENCES)
+        self._ts_epoch[i] = ts_epoch
+        lowered = content.lower()
+        self._has_success[i] = "success" in lowered
+        self._has_fail[i] = "fail" in lowered
+        self._content.append(content)
+        self.size += 1
+        
+    def _rounded_importance(self) -> np.ndarray:
+        """Importance of the stored rows as float64, rounded like ``_view``.
+
+        Comparing the float16 column directly depends on numpy's promotion
+        rules: 0.8 is stored as 0.7998, which numpy 1.x scalars rank below 0.8.
+        """
+        return np.round(self._importance[:self.size].astype(np.float64), self.IMPORTANCE_DECIMALS)
+        
+    def _view(self, i: int) -> Memory:
+        """Build a Memory view of row ``i``."""
+        memory = Memory(self._content[i], round(float(self._importance[i]), self.IMPORTANCE_DECIMALS))
+        memory._ts = float(self._ts_epoch[i])
+        memory.references = int(self._references[i])
+        return memory
+        
+    @property
+    def memories(self) -> List[Memory]:
+        """Snapshot of the stored memories as Memory objects."""
+        return [self._view(i) for i in range(self.size)]
+        
+    def __len__(self) -> int:
+        return self.size
+        
     def _get_memory_file(self) -> Path:
         """Get the memory file path for this agent."""
         return self.logs_dir / f"{self.agent_name}_memories.json"
@@ -59,9 +152,16 @@ class MemoryLogger:
         memory_file = self._get_memory_file()
         if memory_file.exists():
             try:
-                with open(memory_file, 'r') as f:
-                    data = json.load(f)
-                    self.memories = [Memory.from_dict(m) for m in data]
+                data = read_json(memory_file)
+                if len(data) >= self.capacity:
+                    self._grow(len(data) + 1)
+                for m in data:
+                    self._append(
+                        m["content"],
+                        m["importance"],
+                        datetime.fromisoformat(m["timestamp"]).timestamp(),
+                        m.get("references", 0)
+                    )
             except Exception as e:
                 print(f"Error loading memories for {self.agent_name}: {e}")
                 
@@ -69,94 +169,160 @@ class MemoryLogger:
         """Save memories to file."""
         memory_file = self._get_memory_file()
         try:
-            with open(memory_file, 'w') as f:
-                json.dump([m.to_dict() for m in self.memories], f, indent=2)
+            write_json(memory_file, self._to_dicts())
         except Exception as e:
             print(f"Error saving memories for {self.agent_name}: {e}")
+        self._dirty = False
+        self._last_save = time.monotonic()
+            
+    def _to_dicts(self) -> List[Dict]:
+        """Serialize the stored memories to a list of dictionaries."""
+        n = self.size
+        return [
+            {
+                "content": content,
+                "importance": importance,
+                "timestamp": datetime.fromtimestamp(ts).isoformat(),
+                "references": references
+            }
+            for content, importance, ts, references in zip(
+                self._content,
+                self._rounded_importance().tolist(),
+                self._ts_epoch[:n].tolist(),
+                self._references[:n].tolist()
+            )
+        ]
+            
+    def _mark_dirty(self) -> None:
+        """Record unsaved changes, writing them at most once per SAVE_INTERVAL."""
+        self._dirty = True
+        if time.monotonic() - self._last_save > self.SAVE_INTERVAL:
+            self._save_memories()
+            
+    def _flush(self) -> None:
+        """Save memories if there are unsaved changes."""
+        if self._dirty:
+            self._save_memories()
             
+    def _invalidate_summary(self) -> None:
+        """Drop the cached summary so the next call rebuilds it."""
+        self._summary = None
+        self._summary_rows = None
+        
+    def _tier_mask(self, importance: float) -> Optional[np.ndarray]:
+        """Mask of the summary tier holding ``importance``, or None if it has no tier."""
+        stored = self._rounded_importance()
+        importance = round(float(importance), self.IMPORTANCE_DECIMALS)
+        if importance >= 0.8:
+            return stored >= 0.8
+        if importance >= 0.5:
+            return (stored >= 0.5) & (stored < 0.8)
+        return None
+        
     def add_memory(self, content: str, importance: float) -> None:
         """Add a new memory."""
-        memory = Memory(content, importance)
-        self.memories.append(memory)
+        self._append(content, importance, time.time())
+        
+        # A new memory has the fewest references and the latest row, so it only
+        # reaches its tier's top three while the tier has at most three members
+        if self._summary is not None:
+            tier = self._tier_mask(importance)
+            if tier is not None and np.count_nonzero(tier) <= 3:
+                self._invalidate_summary()
         
         # Curate memories if we exceed the limit
-        if len(self.memories) > self.max_memories:
+        if self.size > self.max_memories:
             self._curate_memories()
             
-        self._save_memories()
+        self._mark_dirty()
         
     def _curate_memories(self) -> None:
         """Curate memories based on importance and references."""
-        # Calculate memory scores
-        scored_memories = []
-        for memory in self.memories:
-            # Score based on importance, recency, and references
-            age = (datetime.now() - datetime.fromisoformat(memory.timestamp)).total_seconds()
-            age_factor = 1.0 / (1 + age/86400)  # Decay over days
-            score = memory.importance * (1 + memory.references/10) * age_factor
-            scored_memories.append((memory, score))
+        n = self.size
+        if n <= self.max_memories:
+            return
             
-        # Keep top memories
-        scored_memories.sort(key=lambda x: x[1], reverse=True)
-        self.memories = [m for m, _ in scored_memories[:self.max_memories]]
+        # Score based on importance, recency, and references
+        age = time.time() - self._ts_epoch[:n]
+        age_factor = 1.0 / (1 + age/86400)  # Decay over days
+        scores = self._importance[:n].astype(np.float32) * (1 + self._references[:n]/10) * age_factor
+        
+        # Keep top memories, in their original order
+        keep = np.sort(np.argpartition(-scores, self.max_memories - 1)[:self.max_memories])
+        k = len(keep)
+        
+        # Dropping rows outside the summary leaves each tier's top three as they
+        # were, so the summary survives with its rows renumbered
+        if self._summary_rows is not None:
+            if np.isin(self._summary_rows, keep).all():
+                self._summary_rows = np.searchsorted(keep, self._summary_rows)
+            else:
+                self._invalidate_summary()
+        self._importance[:k] = self._importance[keep]
+        self._references[:k] = self._references[keep]
+        self._ts_epoch[:k] = self._ts_epoch[keep]
+        self._has_success[:k] = self._has_success[keep]
+        self._has_fail[:k] = self._has_fail[keep]
+        self._content = [self._content[i] for i in keep.tolist()]
+        self.size = k
         
     def get_relevant_memories(self, context: Dict, limit: int = 5) -> List[Memory]:
         """Get memories relevant to the current context."""
-        relevant_memories = []
-        
+        n = self.size
+        if n == 0:
+            return []
+            
         # Extract key information from context
-        strike_price = context.get("strike_price")
-        spot_price = context.get("spot_price")
-        recent_success = context.get("recent_success", False)
+        strike_text = str(context.get("strike_price"))
+        spot_text = str(context.get("spot_price"))
+        outcome_flags = self._has_success if context.get("recent_success", False) else self._has_fail
         
-        for memory in self.memories:
-            relevance = 0.0
-            
-            # Check if memory mentions similar prices
-            if str(strike_price) in memory.content:
-                relevance += 0.3
-            if str(spot_price) in memory.content:
-                relevance += 0.2
-                
-            # Success/failure context
-            if recent_success and "success" in memory.content.lower():
-                relevance += 0.2
-            elif not recent_success and "fail" in memory.content.lower():
-                relevance += 0.2
-                
-            # Add some randomness for exploration
-            relevance += random.random() * 0.1
+        def mentions(text: str) -> np.ndarray:
+            return np.fromiter((text in c for c in self._content), dtype=bool, count=n)
             
-            if relevance > 0:
-                relevant_memories.append((memory, relevance))
-                memory.references += 1
-                
-        # Sort by relevance and return top memories
-        relevant_memories.sort(key=lambda x: x[1], reverse=True)
-        selected_memories = [m for m, _ in relevant_memories[:limit]]
+        # Check if memory mentions similar prices, then success/failure context
+        relevance = 0.3 * mentions(strike_text) + 0.2 * mentions(spot_text)
+        relevance += 0.2 * outcome_flags[:n]
+        
+        # Add some randomness for exploration
+        relevance += np.array([random.random() for _ in range(n)]) * 0.1
+        
+        relevant = np.flatnonzero(relevance > 0)
+        relevant_refs = self._references[relevant]
+        self._references[relevant] = relevant_refs + (relevant_refs < self.MAX_REFERENCES)
         
-        # Save updated reference counts
-        self._save_memories()
+        # Partition out the top memories, then sort just those by relevance
+        if len(relevant) > limit:
+            relevant = relevant[np.argpartition(-relevance[relevant], limit - 1)[:limit]]
+        order = relevant[np.argsort(-relevance[relevant], kind="stable")]
+        selected_memories = [self._view(i) for i in order.tolist()]
+        
+        # Updated reference counts are saved with the next flush and can
+        # reorder the summary tiers
+        self._invalidate_summary()
+        self._mark_dirty()
         
         return selected_memories
         
     def summarize_insights(self) -> str:
         """Generate a summary of key insights from memories."""
-        if not self.memories:
+        if self.size == 0:
             return "No memories collected yet."
+        if self._summary is not None:
+            return self._summary
             
-        # Group memories by importance
-        high_importance = []
-        medium_importance = []
-        low_importance = []
-        
-        for memory in self.memories:
-            if memory.importance >= 0.8:
-                high_importance.append(memory)
-            elif memory.importance >= 0.5:
-                medium_importance.append(memory)
-            else:
-                low_importance.append(memory)
+        # Group memories by importance, keeping the three most referenced per tier
+        importance = self._rounded_importance()
+        references = self._references[:self.size]
+        
+        def most_referenced(mask: np.ndarray) -> np.ndarray:
+            tier = np.flatnonzero(mask)
+            return tier[np.argsort(-references[tier], kind="stable")[:3]]
+            
+        high_rows = most_referenced(importance >= 0.8)
+        medium_rows = most_referenced((importance >= 0.5) & (importance < 0.8))
+        high_importance = [self._view(i) for i in high_rows.tolist()]
+        medium_importance = [self._view(i) for i in medium_rows.tolist()]
                 
         # Generate summary
         summary = []
@@ -164,12 +330,15 @@ class MemoryLogger:
         
         if high_importance:
             summary.append("\nKey Learnings:")
-            for memory in sorted(high_importance, key=lambda m: m.references, reverse=True)[:3]:
+            for memory in high_importance:
                 summary.append(f"- {memory.content} (referenced {memory.references} times)")
                 
         if medium_importance:
             summary.append("\nUseful Patterns:")
-            for memory in sorted(medium_importance, key=lambda m: m.references, reverse=True)[:3]:
+            for memory in medium_importance:
                 summary.append(f"- {memory.content}")
                 
-        return "\n".join(summary) 
\ No newline at end of file
+        # Reused until a tier's top three change
+        self._summary = "\n".join(summary)
+        self._summary_rows = np.concatenate([high_rows, medium_rows])
+        return self._summary 
\ No newline at end of file
@@ -4,6 +4,8 @@ Market maker (monkey) agent module for predicting and defending against coconut
 
 from typing import Dict, List, Tuple, Optional
 import random
+
+import numpy as np
 from .profiles.profile_loader import profile_manager
 
 class MonkeyAgent:
@@ -13,7 +15,17 @@ class MonkeyAgent:
         self.defense_history: List[int] = []
         self.last_defense = None
         self.recent_losses: List[bool] = []  # True = loss, False = successful defense
-        self.retail_clusters: Dict[int, float] = {}  # Strike -> Clustering score
+        # Clustering score per strike, aligned with the game state strikes
+        self.retail_clusters = np.zeros(0)
+        self._strikes: Optional[List[int]] = None
+        self._strikes_arr = np.zeros(0)
+
+    def _strike_array(self, strikes: List[int]) -> np.ndarray:
+        """Return the strikes as an array, rebuilt only when the list changes."""
+        if strikes is not self._strikes:
+            self._strikes = strikes
+            self._strikes_arr = np.asarray(strikes, dtype=np.float64)
+        return self._strikes_arr
 
     def _update_game_state_metrics(self, game_state: Dict) -> Dict:
         """Update and return psychological metrics for the game state."""
@@ -24,27 +36,32 @@ class MonkeyAgent:
             recent_loss_rate = 0
             
         # Calculate retail clustering at each strike
-        total_hits = sum(game_state["tree_hits"].values())
-        total_juice = sum(game_state["retail_juice"].values())
-        
-        # Initialize all strikes with minimal clustering
-        self.retail_clusters = {strike: 0.01 for strike in game_state["strikes"]}
+        tree_hits = game_state["tree_hits"]
+        retail_juice = game_state["retail_juice"]
+        total_hits = tree_hits.sum()
+        total_juice = retail_juice.sum()
         
         if total_hits > 0 or total_juice > 0:
-            for strike in game_state["strikes"]:
-                hits_ratio = game_state["tree_hits"].get(strike, 0) / (total_hits + 1)
-                juice_ratio = game_state["retail_juice"].get(strike, 0) / (total_juice + 1)
-                self.retail_clusters[strike] = max(0.01, (hits_ratio + juice_ratio) / 2)
+            clusters = (tree_hits / (total_hits + 1) + retail_juice / (total_juice + 1)) / 2
+            np.maximum(clusters, 0.01, out=clusters)
+        else:
+            # All strikes start with minimal clustering
+            clusters = np.full(len(game_state["strikes"]), 0.01)
+        self.retail_clusters = clusters
         
         # Add psychological metrics to game state
         game_state.update({
             "recent_loss_rate": recent_loss_rate,
-            "retail_clustering": max(self.retail_clusters.values())
+            "retail_clustering": float(clusters.max())
         })
         
         return game_state
 
     async def predict_targets(self, game_state: Dict) -> List[Tuple[int, float]]:
+        """Async wrapper around predict_targets_sync."""
+        return self.predict_targets_sync(game_state)
+
+    def predict_targets_sync(self, game_state: Dict) -> List[Tuple[int, float]]:
         """
         Predict likely strike targets based on current game state and psychological profile.
         
@@ -52,9 +69,9 @@ class MonkeyAgent:
             game_state: Dict containing current game state including:
                 - spot_price: Current spot price
                 - strikes: List of available strikes
-                - tree_hits: Dict of hits per strike
-                - retail_juice: Dict of retail juice per strike
-                - mm_juice: Dict of market maker juice per strike
+                - tree_hits: Array of hits per strike, aligned with strikes
+                - retail_juice: Array of retail juice per strike
+                - mm_juice: Array of market maker juice per strike
                 
         Returns:
             List[Tuple[int, float]]: List of (strike, probability) predictions
@@ -75,54 +92,37 @@ class MonkeyAgent:
             
         spot_price = game_state["spot_price"]
         strikes = game_state["strikes"]
+        strikes_arr = self._strike_array(strikes)
         
-        # Calculate strike scores using profile-weighted factors
-        strike_scores = {}
-        for strike in strikes:
-            score = 0.0
-            
-            # Distance from spot price
-            distance = abs(strike - spot_price)
-            distance_score = 1.0 / (1 + distance/5)
-            score += distance_score * weights["spot_distance"]
-            
-            # Hit history
-            hits = game_state["tree_hits"].get(strike, 0)
-            hit_score = min(1.0, hits / 10)  # Cap at 10 hits
-            score += hit_score * weights["hit_history"]
-            
-            # Juice collection patterns
-            retail_juice = game_state["retail_juice"].get(strike, 0)
-            juice_score = min(1.0, retail_juice)
-            score += juice_score * weights["juice_collection"]
-            
-            # Retail clustering
-            cluster_score = self.retail_clusters.get(strike, 0.01)  # Default to minimal clustering
-            score += cluster_score * weights["retail_clustering"]
-            
-            strike_scores[strike] = score
+        # Calculate strike scores using profile-weighted factors:
+        # distance from spot price, hit history (capped at 10 hits),
+        # juice collection patterns and retail clustering
+        scores = (
+            (1.0 / (1 + np.abs(strikes_arr - spot_price)/5)) * weights["spot_distance"]
+            + np.minimum(1.0, game_state["tree_hits"] / 10) * weights["hit_history"]
+            + np.minimum(1.0, game_state["retail_juice"]) * weights["juice_collection"]
+            + self.retail_clusters * weights["retail_clustering"]
+        )
             
         # Apply psychological modifiers
         profile = profile_manager.get_active_profile("monkey")
         if profile:
             # Risk aversion: Focus more on defending successful strikes when losses are high
             if game_state["recent_loss_rate"] > profile.traits.get("risk_aversion", 0):
-                for strike in strikes:
-                    if strike in self.defense_history[-3:]:
-                        strike_scores[strike] *= 1.2
+                scores[np.isin(strikes_arr, self.defense_history[-3:])] *= 1.2
                         
             # Reflexivity awareness: Adjust predictions based on recent retail patterns
             if profile.traits.get("reflexivity_awareness", False):
-                # Find strike with highest clustering
-                max_cluster_strike = max(self.retail_clusters.items(), key=lambda x: x[1])[0]
-                strike_scores[max_cluster_strike] *= 1.3
+                # Boost the strike with highest clustering
+                scores[np.argmax(self.retail_clusters)] *= 1.3
                 
-        # Sort strikes by score and calculate probabilities
-        sorted_strikes = sorted(strike_scores.items(), key=lambda x: x[1], reverse=True)
-        total_score = sum(score for _, score in sorted_strikes[:3])
+        # Take the top strikes by score (ties keep strike order) and calculate probabilities
+        top = np.argsort(-scores, kind="stable")[:3].tolist()
+        top_scores = scores[top].tolist()
+        total_score = sum(top_scores)
         
         if total_score > 0:
-            predictions = [(strike, score/total_score) for strike, score in sorted_strikes[:3]]
+            predictions = [(strikes[i], score/total_score) for i, score in zip(top, top_scores)]
         else:
             # Fallback to defending strikes near spot price
             nearby_strikes = sorted(strikes, key=lambda s: abs(s - spot_price))[:3]
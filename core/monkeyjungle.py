@@ -1,7 +1,15 @@
-import matplotlib.pyplot as plt
-import pandas as pd
 import numpy as np
-import random
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; simulate_all then runs as plain Python
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback decorator that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
 # Constants
 spot_price = 628.86
@@ -10,59 +18,93 @@ dte = 5
 strikes = list(range(610, 646))
 gamma_strengths = {s: 0.2 + 0.02 * abs(s - 628) for s in strikes}
 trials = 1000
+seed = None  # Set an int for a reproducible run
 
-# Initialize result storage
-hits = {s: 0 for s in strikes}
-retail_juice = {s: 0.0 for s in strikes}
-mm_juice = {s: 0.0 for s in strikes}
-
-# Flying coconut tracker
-flying_coconuts = []
-
-# Simulation function
-def simulate_slingshot_hit(spot_price, strike_price, gamma_strength, implied_vol, dte):
-    delta_distance = abs(spot_price - strike_price)
+# Hit probability per strike, vectorized over strikes
+def slingshot_hit_chance(spot_price, strike_prices, gamma_strength, implied_vol, dte):
+    delta_distance = np.abs(spot_price - strike_prices)
     base_hit_chance = 1.0 / (1 + delta_distance)
     wind_penalty = implied_vol / 100
     gamma_penalty = gamma_strength / 10
     decay_penalty = max(0.1, dte / 30)
     final_hit_chance = base_hit_chance * (1 - wind_penalty) * (1 - gamma_penalty) * (1 / decay_penalty)
-    final_hit_chance = max(0, min(final_hit_chance, 1))
-    hit = random.random() < final_hit_chance
-    mm_juice_sip = 0.7 if hit else 0
-    retail_juice = (1 - mm_juice_sip) if hit else 0
-    return hit, retail_juice, mm_juice_sip
+    return np.clip(final_hit_chance, 0, 1)
+
+# Scalar-loop variant for path-dependent experiments; strikes are independent,
+# so they are spread across cores and each thread owns its output slots
+@njit(parallel=True, fastmath=True)
+def simulate_all(spot_price, strike_arr, gamma_arr, implied_vol, dte, trials):
+    n = strike_arr.shape[0]
+    hits = np.zeros(n, dtype=np.int64)
+    wind_penalty = implied_vol / 100
+    decay_penalty = max(0.1, dte / 30)
+    for i in prange(n):
+        chance = (1.0 / (1 + abs(spot_price - strike_arr[i]))) * (1 - wind_penalty) \
+            * (1 - gamma_arr[i] / 10) * (1 / decay_penalty)
+        chance = min(max(chance, 0.0), 1.0)
+        count = 0
+        for _ in range(trials):
+            if np.random.random() < chance:
+                count += 1
+        hits[i] = count
+    return hits
+
+def run_simulation(trials=trials, spot_price=spot_price, implied_vol=implied_vol, dte=dte,
+                   strikes=strikes, gamma_strengths=gamma_strengths, seed=seed, loop=False):
+    """Simulate chaos and return per-strike stats as a dict of aligned arrays.
+
+    By default one (trials, strikes) grid of draws is compared against the hit
+    chances. loop=True runs simulate_all instead; its draws come from numba's
+    own generator, so seed does not apply there.
+    """
+    strike_arr = np.asarray(strikes, dtype=np.float64)
+    gamma_arr = np.asarray([gamma_strengths[s] for s in strikes], dtype=np.float64)
+    if loop:
+        hits = simulate_all(spot_price, strike_arr, gamma_arr, implied_vol, dte, trials)
+    else:
+        rng = np.random.default_rng(seed)
+        hit_chance = slingshot_hit_chance(spot_price, strike_arr, gamma_arr, implied_vol, dte)
+        draws = rng.random((trials, len(strikes)), dtype=np.float32) < hit_chance
+        hits = draws.sum(axis=0)
+
+    mm_juice = 0.7 * hits
+    retail_juice = (1 - 0.7) * hits
+
+    return {
+        'strike': np.asarray(strikes),
+        'hits': hits,
+        'retail_juice': retail_juice,
+        'mm_juice': mm_juice
+    }
 
-# Simulate chaos
-for t in range(trials):
-    for s in strikes:
-        hit, retail, mm = simulate_slingshot_hit(spot_price, s, gamma_strengths[s], implied_vol, dte)
-        if hit:
-            hits[s] += 1
-            retail_juice[s] += retail
-            mm_juice[s] += mm
-            # Add flying coconut
-            flying_coconuts.append((t, s))
+def _plot(stats, spot_price=spot_price):
+    """Static plot to visualize results."""
+    import matplotlib.pyplot as plt
 
-# Create DataFrame for plotting
-df = pd.DataFrame({
-    'strike': strikes,
-    'hits': [hits[s] for s in strikes],
-    'retail_juice': [retail_juice[s] for s in strikes],
-    'mm_juice': [mm_juice[s] for s in strikes]
-})
+    fig, ax = plt.subplots(figsize=(14, 6))
+    bar1 = ax.bar(stats['strike'], stats['retail_juice'], label='Retail Juice', color='green')
+    bar2 = ax.bar(stats['strike'], stats['mm_juice'], bottom=stats['retail_juice'], label='MM Juice', color='orange')
+    ax.axvline(x=spot_price, color='red', linestyle='--', label='Spot Price')
+    ax.set_xlabel("Strike Price")
+    ax.set_ylabel("Total Juice (Simulated)")
+    ax.set_title("Gamma Defense Coconut Simulation - Chaos Mode")
+    ax.legend()
+    plt.tight_layout()
+    plt.show()
 
-# Static plot to visualize results
-fig, ax = plt.subplots(figsize=(14, 6))
-bar1 = ax.bar(df['strike'], df['retail_juice'], label='Retail Juice', color='green')
-bar2 = ax.bar(df['strike'], df['mm_juice'], bottom=df['retail_juice'], label='MM Juice', color='orange')
-ax.axvline(x=spot_price, color='red', linestyle='--', label='Spot Price')
-ax.set_xlabel("Strike Price")
-ax.set_ylabel("Total Juice (Simulated)")
-ax.set_title("Gamma Defense Coconut Simulation - Chaos Mode")
-ax.legend()
-plt.tight_layout()
-plt.show()
+def _show_table(stats):
+    """Show data in a table."""
+    try:
+        import ace_tools as tools
+    except ImportError:
+        print(" ".join(f"{name:>12}" for name in stats))
+        for row in zip(*stats.values()):
+            print(" ".join(f"{value:>12.1f}" for value in row))
+        return
+    import pandas as pd
+    tools.display_dataframe_to_user(name="Jungle Chaos Coconut Stats", dataframe=pd.DataFrame(stats))
 
-# Show data in a table
-import ace_tools as tools; tools.display_dataframe_to_user(name="Jungle Chaos Coconut Stats", dataframe=df)
+if __name__ == "__main__":
+    stats = run_simulation()
+    _plot(stats)
+    _show_table(stats)
@@ -2,11 +2,12 @@
 Profile loader module for managing agent psychological profiles.
 """
 
-import json
 import os
-from typing import Dict, Any, Optional
+import pickle
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
+from ..json_io import read_json
 
 @dataclass
 class AgentProfile:
@@ -44,59 +45,104 @@ class AgentProfile:
 class ProfileManager:
     """Manages loading and hot-swapping of agent profiles."""
     
+    AGENT_TYPES = ("monkey", "retail")
+    
     def __init__(self):
         # Get the profiles directory path
         self.profiles_dir = Path(__file__).parent
+        # Normalized weights per (agent type, profile, bias branches taken)
+        self._weights_cache: Dict[Tuple[str, str, int], Dict[str, float]] = {}
+        # Filled per agent type on first access
         self.loaded_profiles: Dict[str, Dict[str, AgentProfile]] = {}
+        self._profile_files: Optional[Dict[str, List[Path]]] = None
         self.active_profiles: Dict[str, str] = {
             "monkey": "monkey_profile.json",
             "retail": "retail_profile.json"
         }
         
-        # Load all available profiles
-        self._load_all_profiles()
+    def _cache_file(self, agent_type: str) -> Path:
+        """Pickle of parsed profiles, reused while no profile file has changed."""
+        return self.profiles_dir / f".{agent_type}_profile_cache.pkl"
         
-    def _load_all_profiles(self) -> None:
-        """Load all profile files from the profiles directory."""
-        self.loaded_profiles = {
-            "monkey": {},
-            "retail": {}
-        }
+    def _scan_profile_files(self) -> Dict[str, List[Path]]:
+        """Sort the profile files by agent type in one directory pass."""
+        if self._profile_files is None:
+            files: Dict[str, List[Path]] = {agent_type: [] for agent_type in self.AGENT_TYPES}
+            with os.scandir(self.profiles_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not name.endswith(".json") or not entry.is_file():
+                        continue
+                    agent_type = name.split("_", 1)[0]
+                    if agent_type in files:
+                        files[agent_type].append(Path(entry.path))
+            for paths in files.values():
+                paths.sort()
+            self._profile_files = files
+        return self._profile_files
         
+    def _profiles(self, agent_type: str) -> Optional[Dict[str, AgentProfile]]:
+        """Get the profiles for an agent type, loading them on first use."""
+        profiles = self.loaded_profiles.get(agent_type)
+        if profiles is None and agent_type in self.AGENT_TYPES:
+            profiles = self.loaded_profiles[agent_type] = self._load_profiles(agent_type)
+        return profiles
+        
+    def _load_profiles(self, agent_type: str) -> Dict[str, AgentProfile]:
+        """Load all profile files of one agent type from the profiles directory."""
+        profiles: Dict[str, AgentProfile] = {}
         try:
-            # Load monkey profiles
-            monkey_profiles = list(self.profiles_dir.glob("monkey_*.json"))
-            if not monkey_profiles:
-                print(f"Warning: No monkey profiles found in {self.profiles_dir}")
-            for profile_path in monkey_profiles:
-                profile = self._load_profile(profile_path)
-                if profile:
-                    self.loaded_profiles["monkey"][profile_path.name] = profile
-                    
-            # Load retail profiles
-            retail_profiles = list(self.profiles_dir.glob("retail_*.json"))
-            if not retail_profiles:
-                print(f"Warning: No retail profiles found in {self.profiles_dir}")
-            for profile_path in retail_profiles:
-                profile = self._load_profile(profile_path)
-                if profile:
-                    self.loaded_profiles["retail"][profile_path.name] = profile
+            profile_paths = self._scan_profile_files()[agent_type]
+            if not profile_paths:
+                print(f"Warning: No {agent_type} profiles found in {self.profiles_dir}")
+                
+            manifest = {}
+            for path in profile_paths:
+                stat = path.stat()
+                manifest[path.name] = (stat.st_mtime_ns, stat.st_size)
+            cached = self._read_profile_cache(agent_type, manifest)
+            if cached is not None:
+                profiles = cached
+            else:
+                for profile_path in profile_paths:
+                    profile = self._load_profile(profile_path)
+                    if profile:
+                        profiles[profile_path.name] = profile
+                self._write_profile_cache(agent_type, manifest, profiles)
                     
-            print(f"Loaded profiles from {self.profiles_dir}:")
-            print(f"Monkey profiles: {list(self.loaded_profiles['monkey'].keys())}")
-            print(f"Retail profiles: {list(self.loaded_profiles['retail'].keys())}")
+            print(f"Loaded {agent_type} profiles from {self.profiles_dir}: {list(profiles.keys())}")
             
         except Exception as e:
             print(f"Error loading profiles: {e}")
             print(f"Profiles directory: {self.profiles_dir}")
             print(f"Directory exists: {self.profiles_dir.exists()}")
             print(f"Directory contents: {list(self.profiles_dir.glob('*'))}")
+        return profiles
     
+    def _read_profile_cache(self, agent_type: str,
+                            manifest: Dict[str, tuple]) -> Optional[Dict[str, AgentProfile]]:
+        """Return cached profiles if they were parsed from the files in manifest."""
+        try:
+            with open(self._cache_file(agent_type), 'rb') as f:
+                cached_manifest, profiles = pickle.load(f)
+        except Exception:
+            return None  # No usable cache yet
+        return profiles if cached_manifest == manifest else None
+        
+    def _write_profile_cache(self, agent_type: str, manifest: Dict[str, tuple],
+                             profiles: Dict[str, AgentProfile]) -> None:
+        """Store parsed profiles together with the manifest they came from."""
+        cache_file = self._cache_file(agent_type)
+        try:
+            with open(cache_file, 'wb') as f:
+                pickle.dump((manifest, profiles), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"Warning: Could not write profile cache {cache_file}: {e}")
+            
     def _load_profile(self, profile_path: Path) -> Optional[AgentProfile]:
         """Load a single profile from file."""
         try:
-            with open(profile_path, 'r') as f:
-                data = json.load(f)
+            data = read_json(profile_path)
             return AgentProfile.from_dict(data)
         except Exception as e:
             print(f"Error loading profile {profile_path}: {e}")
@@ -104,53 +150,78 @@ class ProfileManager:
             
     def get_active_profile(self, agent_type: str) -> Optional[AgentProfile]:
         """Get the currently active profile for an agent type."""
-        if agent_type not in self.loaded_profiles:
+        profiles = self._profiles(agent_type)
+        if profiles is None:
             return None
             
         active_filename = self.active_profiles[agent_type]
-        return self.loaded_profiles[agent_type].get(active_filename)
+        return profiles.get(active_filename)
         
     def list_available_profiles(self, agent_type: str) -> list[str]:
         """List all available profiles for an agent type."""
-        if agent_type not in self.loaded_profiles:
+        profiles = self._profiles(agent_type)
+        if profiles is None:
             return []
-        return list(self.loaded_profiles[agent_type].keys())
+        return list(profiles.keys())
         
     def switch_profile(self, agent_type: str, profile_name: str) -> bool:
         """Switch the active profile for an agent type."""
-        if (agent_type not in self.loaded_profiles or 
-            profile_name not in self.loaded_profiles[agent_type]):
+        profiles = self._profiles(agent_type)
+        if profiles is None or profile_name not in profiles:
             return False
             
         self.active_profiles[agent_type] = profile_name
+        self._weights_cache.clear()
         return True
         
+    @staticmethod
+    def _bias_branches(agent_type: str, game_state: Dict[str, Any]) -> int:
+        """Encode which game-state bias thresholds are crossed as a bit mask."""
+        if agent_type == "retail":
+            return ((game_state.get("recent_success_rate", 0) > 0.5) << 1
+                    | (game_state.get("crowd_size", 0) > 3))
+        if agent_type == "monkey":
+            return ((game_state.get("recent_loss_rate", 0) > 0.3) << 1
+                    | (game_state.get("retail_clustering", 0) > 0.5))
+        return 0
+        
     def apply_profile_to_agent(self, agent_type: str, game_state: Dict[str, Any]) -> Dict[str, float]:
-        """Apply psychological profile to modify agent behavior weights."""
+        """Apply psychological profile to modify agent behavior weights.
+        
+        Weights depend only on which bias thresholds the game state crosses, so
+        they are computed once per combination; the returned dict is shared and
+        must not be modified.
+        """
         profile = self.get_active_profile(agent_type)
         if not profile:
             return {}
             
+        branches = self._bias_branches(agent_type, game_state)
+        key = (agent_type, self.active_profiles[agent_type], branches)
+        cached = self._weights_cache.get(key)
+        if cached is not None:
+            return cached
+            
         weights = profile.behavior_weights.copy()
         
         # Apply biases based on game state
         if agent_type == "retail":
             # Adjust weights based on retail psychological factors
-            if game_state.get("recent_success_rate", 0) > 0.5:
+            if branches & 2:
                 # Increase overconfidence when doing well
                 weights["spot_distance"] *= (1 + profile.biases["overconfidence"])
                 
-            if game_state.get("crowd_size", 0) > 3:
+            if branches & 1:
                 # Increase herd behavior when others are targeting same strikes
                 weights["crowd_following"] *= (1 + profile.biases["herd_mentality"])
                 
         elif agent_type == "monkey":
             # Adjust weights based on market maker psychological factors
-            if game_state.get("recent_loss_rate", 0) > 0.3:
+            if branches & 2:
                 # Increase defensive behavior when taking losses
                 weights["spot_distance"] *= (1 + profile.biases["loss_aversion"])
                 
-            if game_state.get("retail_clustering", 0) > 0.5:
+            if branches & 1:
                 # Increase focus on retail patterns when clustering is detected
                 weights["retail_clustering"] *= (1 + profile.biases["recency"])
                 
@@ -159,6 +230,7 @@ class ProfileManager:
         if total > 0:
             weights = {k: v/total for k, v in weights.items()}
             
+        self._weights_cache[key] = weights
         return weights
 
 # Create global profile manager instance
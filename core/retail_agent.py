@@ -4,40 +4,72 @@ Retail agent module for coconut targeting decisions.
 
 from typing import Dict, List, Tuple, Optional
 import random
+
+import numpy as np
 from .profiles.profile_loader import profile_manager
+from .engine_kernels import retail_scores
 
 class RetailAgent:
     """Retail agent that uses psychological profiles for targeting."""
-    def __init__(self, name: str = "RetailAgent"):
+    RECENT_WINDOW = 5
+    _RECENT_MASK = (1 << RECENT_WINDOW) - 1
+    
+    def __init__(self, name: str = "RetailAgent", seed: Optional[int] = None):
         self.name = name
+        # Own generator for FOMO rolls and fallback picks, independent of the global one
+        self._rng = random.Random(seed)
         self.last_target = None
         self.target_history: List[int] = []
-        self.recent_hits: List[bool] = []
-        self.crowd_size: Dict[int, int] = {}  # Strike -> Number of agents targeting it
+        # Last RECENT_WINDOW targeting results packed as bits, newest in bit 0
+        self._hits_bits = 0
+        self._hits_len = 0
+        # Number of agents targeting each strike, aligned with the game state strikes
+        self.crowd_size = np.zeros(0, dtype=np.int32)
+        self._crowd_buf = np.zeros(0)  # Float scratch space for the crowd update
+        self._strikes: Optional[List[int]] = None
+        self._strikes_arr = np.zeros(0)
+
+    def _strike_array(self, strikes: List[int]) -> np.ndarray:
+        """Return the strikes as an array, rebuilt only when the list changes."""
+        if strikes is not self._strikes:
+            self._strikes = strikes
+            self._strikes_arr = np.asarray(strikes, dtype=np.float64)
+        return self._strikes_arr
 
     def _update_game_state_metrics(self, game_state: Dict) -> Dict:
         """Update and return psychological metrics for the game state."""
         # Calculate recent success rate
-        if self.recent_hits:
-            recent_success_rate = sum(1 for hit in self.recent_hits[-5:] if hit) / len(self.recent_hits[-5:])
+        if self._hits_len:
+            recent_success_rate = bin(self._hits_bits).count("1") / self._hits_len
         else:
             recent_success_rate = 0
             
         # Calculate crowd sizes at each strike
-        for strike in game_state["strikes"]:
-            hits = game_state["tree_hits"].get(strike, 0)
-            retail_juice = game_state["retail_juice"].get(strike, 0)
-            self.crowd_size[strike] = int((hits + retail_juice * 10) / 2)
+        # Written in place so the per-frame update allocates nothing
+        n = len(game_state["strikes"])
+        if len(self.crowd_size) != n:
+            self.crowd_size = np.zeros(n, dtype=np.int32)
+            self._crowd_buf = np.zeros(n)
+        buf = self._crowd_buf
+        np.multiply(game_state["retail_juice"], 10, out=buf)
+        buf += game_state["tree_hits"]
+        buf /= 2
+        np.trunc(buf, out=buf)
+        self.crowd_size[:] = buf
             
         # Add psychological metrics to game state
         game_state.update({
             "recent_success_rate": recent_success_rate,
-            "crowd_size": max(self.crowd_size.values()) if self.crowd_size else 0
+            "crowd_size": int(self.crowd_size.max()) if len(self.crowd_size) else 0
         })
         
         return game_state
 
     async def select_target(self, game_state: Dict) -> Tuple[int, float]:
+        """Async wrapper around select_target_sync."""
+        return self.select_target_sync(game_state)
+
+    def select_target_sync(self, game_state: Dict) -> Tuple[int, float]:
         """
         Select a strike price to target based on current game state and psychological profile.
         
@@ -45,9 +77,9 @@ class RetailAgent:
             game_state: Dict containing current game state including:
                 - spot_price: Current spot price
                 - strikes: List of available strikes
-                - tree_hits: Dict of hits per strike
-                - retail_juice: Dict of retail juice per strike
-                - mm_juice: Dict of market maker juice per strike
+                - tree_hits: Array of hits per strike, aligned with strikes
+                - retail_juice: Array of retail juice per strike
+                - mm_juice: Array of market maker juice per strike
                 
         Returns:
             Tuple[int, float]: Selected strike price and confidence score
@@ -68,48 +100,36 @@ class RetailAgent:
             
         spot_price = game_state["spot_price"]
         strikes = game_state["strikes"]
+        strikes_arr = self._strike_array(strikes)
         
-        # Calculate strike scores using profile-weighted factors
-        strike_scores = {}
-        for strike in strikes:
-            score = 0.0
-            
-            # Distance from spot price (prefer closer strikes)
-            distance = abs(strike - spot_price)
-            distance_score = 1.0 / (1 + distance/5)
-            score += distance_score * weights["spot_distance"]
-            
-            # Success history (prefer previously successful strikes)
-            history_score = 0.0
-            if strike in self.target_history[-5:]:
-                history_score = 1.0
-            score += history_score * weights["success_history"]
-            
-            # MM defense (prefer less defended strikes)
-            mm_score = 1.0 - game_state["mm_juice"].get(strike, 0)
-            score += mm_score * weights["mm_defense"]
-            
-            # Crowd following (prefer popular strikes)
-            crowd_score = min(1.0, self.crowd_size.get(strike, 0) / 5)
-            score += crowd_score * weights["crowd_following"]
-            
-            strike_scores[strike] = score
-            
         # Select target based on scores
-        if strike_scores:
+        if len(strikes):
             # Sometimes follow the crowd more strongly based on FOMO
+            boost = -1
             profile = profile_manager.get_active_profile("retail")
-            if profile and random.random() < profile.traits.get("fomo_threshold", 0):
+            if profile and self._rng.random() < profile.traits.get("fomo_threshold", 0):
                 # Increase weight of crowd following
-                max_crowd_strike = max(strikes, key=lambda s: self.crowd_size.get(s, 0))
-                strike_scores[max_crowd_strike] *= 1.5
+                boost = int(np.argmax(self.crowd_size))
                 
-            # Select strike with highest score
-            target = max(strike_scores.items(), key=lambda x: x[1])[0]
-            confidence = strike_scores[target]
+            # Score strikes using profile-weighted factors (prefer strikes
+            # close to spot, previously targeted, less defended by the MM and
+            # popular with the crowd) and select the highest
+            best, confidence = retail_scores(
+                strikes_arr,
+                float(spot_price),
+                np.asarray(game_state["mm_juice"], dtype=np.float64),
+                self.crowd_size,
+                np.isin(strikes_arr, self.target_history[-5:]),
+                weights["spot_distance"],
+                weights["success_history"],
+                weights["mm_defense"],
+                weights["crowd_following"],
+                boost
+            )
+            target = strikes[best]
         else:
             # Fallback to random selection
-            target = random.choice(strikes)
+            target = self._rng.choice(strikes)
             confidence = 0.5
             
         # Update history
@@ -118,10 +138,9 @@ class RetailAgent:
         if len(self.target_history) > 10:
             self.target_history = self.target_history[-10:]
             
-        return target, min(confidence, 1.0)
+        return target, confidence
 
     def record_hit(self, hit: bool) -> None:
         """Record the result of a targeting attempt."""
-        self.recent_hits.append(hit)
-        if len(self.recent_hits) > 10:
-            self.recent_hits = self.recent_hits[-10:] 
\ No newline at end of file
+        self._hits_bits = ((self._hits_bits << 1) | bool(hit)) & self._RECENT_MASK
+        self._hits_len = min(self._hits_len + 1, self.RECENT_WINDOW) 
\ No newline at end of file
@@ -2,8 +2,10 @@
 Save manager module for saving game states and replays.
 """
 
-import json
+import asyncio
+import atexit
 import os
+import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, List
@@ -11,6 +13,7 @@ import pandas as pd
 import pygame
 import numpy as np
 import imageio
+from .json_io import ZSTD_SUFFIX, read_json, write_json
 
 class SaveManager:
     """Manages saving game states and statistics."""
@@ -19,73 +22,174 @@ class SaveManager:
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
         self.recording = False
-        self.frames: List[np.ndarray] = []
+        # Frames are downsampled and handed to a GIF writer as they are captured;
+        # each stream gets its own file so a pending save can still move it.
+        # imageio's pillow writer keeps the frames until the stream is closed,
+        # so memory is bounded by max_frames half-size frames
+        self.recording_path: Optional[Path] = None
+        self._stream_id = 0
+        self._writer = None
+        self.frame_count = 0
         self.max_frames = max_frames
+        atexit.register(self.close)
         print(f"SaveManager initialized with {max_frames} frame limit")
         
     def start_recording(self) -> None:
         """Start recording frames for GIF."""
         self.recording = True
-        self.frames = []
+        self._open_writer()
         print(f"Started recording (limit: {self.max_frames} frames)")
         
     def stop_recording(self) -> None:
-        """Stop recording frames."""
+        """Stop recording frames.
+        
+        Captured frames stay pending for the next save; a stream with no
+        frames would never be saved, so it is discarded here.
+        """
+        self.recording = False
+        if not self.frame_count:
+            self._discard_writer()
+            
+    def close(self) -> None:
+        """Discard any unsaved GIF stream; registered to run at exit."""
         self.recording = False
+        self._discard_writer()
+        
+    def _discard_writer(self) -> None:
+        """Close the current GIF stream and delete its temporary file."""
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception as e:
+                print(f"Error closing GIF stream: {e}")
+            self._writer = None
+            self.recording_path.unlink(missing_ok=True)
+        self.frame_count = 0
+        
+    def _open_writer(self) -> None:
+        """Start a fresh GIF stream, discarding any unsaved one."""
+        self._discard_writer()
+        self._stream_id += 1
+        self.recording_path = self.base_dir / f".recording_{self._stream_id}.gif"
+        self._writer = imageio.get_writer(str(self.recording_path), mode="I", fps=30)
+        self.frame_count = 0
         
     def capture_frame(self, screen: pygame.Surface) -> None:
         """Capture current frame if recording is active."""
-        if self.recording and len(self.frames) < self.max_frames:
+        if self.recording and self.frame_count < self.max_frames:
             try:
-                # Convert pygame surface to numpy array
-                frame = pygame.surfarray.array3d(screen)
-                # Transpose to correct dimensions
-                frame = frame.transpose([1, 0, 2])
-                self.frames.append(frame)
-                frames_left = self.max_frames - len(self.frames)
-                if len(self.frames) % 30 == 0:  # Log every second
-                    print(f"Captured frame {len(self.frames)}/{self.max_frames} ({frames_left} remaining)")
+                # View the surface pixels in place, then copy only the
+                # half-size, transposed frame out before releasing the lock
+                pixels = pygame.surfarray.pixels3d(screen)
+                frame = np.ascontiguousarray(pixels[::2, ::2].swapaxes(0, 1))
+                del pixels
+                self._writer.append_data(frame)
+                self.frame_count += 1
+                frames_left = self.max_frames - self.frame_count
+                if self.frame_count % 30 == 0:  # Log every second
+                    print(f"Captured frame {self.frame_count}/{self.max_frames} ({frames_left} remaining)")
                 if frames_left == 0:
                     print("Frame limit reached, stopping recording...")
                     self.stop_recording()
             except Exception as e:
                 print(f"Error capturing frame: {e}")
             
-    def save_game_state(self, engine, timestamp: Optional[str] = None) -> str:
-        """Save current game state to a JSON file."""
+    def save_game_state(self, engine, timestamp: Optional[str] = None, debug: bool = False) -> str:
+        """Save current game state to a JSON file.
+        
+        JSON is written compact; debug=True writes uncompressed, indented
+        files for reading by hand.
+        """
+        return self._write_session(self._snapshot(engine, timestamp, debug))
+        
+    def start_save(self, engine, timestamp: Optional[str] = None,
+                   debug: bool = False) -> "asyncio.Task[str]":
+        """Snapshot the game now and write the session on a worker thread.
+        
+        Must be called from a running event loop. The engine is only read
+        here, so the game loop can keep updating it while the returned task
+        writes the session; keep a reference to the task and await it before
+        shutting down.
+        """
+        session = self._snapshot(engine, timestamp, debug)
+        return asyncio.create_task(asyncio.to_thread(self._write_session, session))
+        
+    async def save_game_state_async(self, engine, timestamp: Optional[str] = None,
+                                    debug: bool = False) -> str:
+        """Save current game state, doing the file writes on a worker thread.
+        
+        Awaiting this suspends the caller until the write finishes; a game
+        loop that must keep running should use start_save instead.
+        """
+        return await self.start_save(engine, timestamp, debug)
+        
+    def _snapshot(self, engine, timestamp: Optional[str], debug: bool = False) -> Dict:
+        """Copy everything a session save needs out of the engine and recorder."""
         if timestamp is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
+        # Hand the GIF stream over to the save and keep recording into a new one
+        replay = None
+        if self.frame_count:
+            replay = (self._writer, self.recording_path, self.frame_count)
+            self._writer = None
+            self.frame_count = 0
+            if self.recording:
+                self._open_writer()
+                
+        strikes = list(engine.valid_strikes)
+        gamma = engine.config.GAMMA_STRENGTH
+        suffix = "" if debug else ZSTD_SUFFIX
+        return {
+            "timestamp": timestamp,
+            "replay": replay,
+            "debug": debug,
+            "state": {
+                "timestamp": timestamp,
+                "spot_price": engine.config.SPOT_PRICE,
+                "implied_vol": engine.config.IMPLIED_VOL,
+                "frame": engine.frame,
+                "strikes": strikes,
+                "tree_hits": engine.per_strike(engine.tree_hits),
+                "retail_juice": engine.per_strike(engine.retail_juice),
+                "mm_juice": engine.per_strike(engine.mm_juice),
+                "gamma_profile": dict(gamma),
+                "ai_enabled": dict(engine.ai_enabled),
+                "current_slingshot": dict(engine.current_slingshot),
+            },
+            "memories": {
+                f"retail_memories.json{suffix}": [m.to_dict() for m in engine.retail_memory.memories],
+                f"monkey_memories.json{suffix}": [m.to_dict() for m in engine.monkey_memory.memories],
+            },
+            # Per-strike engine state is already held in arrays aligned with valid_strikes
+            "statistics": {
+                "strike": np.asarray(strikes),
+                "hits": engine.tree_hits.copy(),
+                "retail_juice": engine.retail_juice.copy(),
+                "mm_juice": engine.mm_juice.copy(),
+                "gamma": engine.gamma_strength.copy(),
+            },
+        }
+        
+    def _write_session(self, session: Dict) -> str:
+        """Write a snapshot taken by _snapshot to its session directory."""
+        timestamp = session["timestamp"]
+        
         # Create session directory
         session_dir = self.base_dir / timestamp
         session_dir.mkdir(exist_ok=True)
         
         # Save GIF if we have recorded frames
-        if self.frames:
-            print(f"Preparing to save GIF with {len(self.frames)} frames...")
+        if session["replay"] is not None:
+            writer, recording_path, frame_count = session["replay"]
+            print(f"Preparing to save GIF with {frame_count} frames...")
             gif_path = session_dir / "replay.gif"
             try:
-                # Ensure frames are valid
-                if not all(isinstance(f, np.ndarray) for f in self.frames):
-                    print("Error: Invalid frame data")
-                    for i, f in enumerate(self.frames):
-                        print(f"Frame {i} type: {type(f)}")
-                    raise ValueError("Invalid frame data")
-
-                # Check frame dimensions
-                if self.frames:
-                    print(f"Frame dimensions: {self.frames[0].shape}")
-
-                # Reduce size to save space
-                print("Resizing frames...")
-                frames = [self._resize_frame(frame, 0.5) for frame in self.frames]
-                
+                # Finish the stream and move it into the session
                 print(f"Saving GIF to {gif_path}...")
-                imageio.mimsave(str(gif_path), frames, fps=30)
-                print(f"Successfully saved replay GIF with {len(self.frames)} frames")
-                
-                # Clear frames after saving
-                self.frames = []
+                writer.close()
+                shutil.move(str(recording_path), str(gif_path))
+                print(f"Successfully saved replay GIF with {frame_count} frames")
             except Exception as e:
                 print(f"Error saving GIF: {e}")
                 import traceback
@@ -93,32 +197,27 @@ class SaveManager:
         
         # Save other game state data
         try:
-            # Collect game state
-            state = {
-                "timestamp": timestamp,
-                "spot_price": engine.config.SPOT_PRICE,
-                "implied_vol": engine.config.IMPLIED_VOL,
-                "frame": engine.frame,
-                "strikes": engine.valid_strikes,
-                "tree_hits": engine.tree_hits,
-                "retail_juice": engine.retail_juice,
-                "mm_juice": engine.mm_juice,
-                "gamma_profile": engine.config.GAMMA_STRENGTH,
-                "ai_enabled": engine.ai_enabled,
-                "current_slingshot": engine.current_slingshot,
-            }
+            state = session["state"]
+            debug = session["debug"]
             
             # Save main state
-            state_file = session_dir / "game_state.json"
-            with open(state_file, 'w') as f:
-                json.dump(state, f, indent=2)
+            state_file = session_dir / f"game_state.json{'' if debug else ZSTD_SUFFIX}"
+            write_json(state_file, state, indent=debug)
+            
+            # Small tab-separated summary so list_saved_games can skip the JSON
+            has_replay = (session_dir / "replay.gif").exists()
+            (session_dir / "session.meta").write_text(
+                f"{timestamp}\t{state['spot_price']}\t{state['frame']}\t{int(has_replay)}"
+            )
                 
             # Save agent memories
-            self._save_memories(engine.retail_memory, session_dir / "retail_memories.json")
-            self._save_memories(engine.monkey_memory, session_dir / "monkey_memories.json")
+            for filename, memories in session["memories"].items():
+                write_json(session_dir / filename, memories, indent=debug)
             
             # Save statistics as CSV
-            self._save_statistics(engine, session_dir / "statistics.csv")
+            pd.DataFrame(session["statistics"]).to_csv(
+                session_dir / "statistics.csv", index=False, lineterminator="\n"
+            )
             
             print(f"Game state saved to {session_dir}")
             return str(session_dir)
@@ -128,37 +227,11 @@ class SaveManager:
             traceback.print_exc()
             return str(session_dir)
         
-    def _resize_frame(self, frame: np.ndarray, scale: float) -> np.ndarray:
-        """Resize frame to reduce GIF size."""
-        try:
-            if scale == 1:
-                return frame
-            # Use simple downsampling instead of interpolation
-            return frame[::2, ::2]
-        except Exception as e:
-            print(f"Error resizing frame: {e}")
-            return frame
-        
-    def _save_memories(self, memory_logger, filepath: Path) -> None:
-        """Save agent memories to JSON."""
-        memories = [memory.to_dict() for memory in memory_logger.memories]
-        with open(filepath, 'w') as f:
-            json.dump(memories, f, indent=2)
-            
-    def _save_statistics(self, engine, filepath: Path) -> None:
-        """Save game statistics to CSV."""
-        stats = []
-        for strike in engine.valid_strikes:
-            stats.append({
-                "strike": strike,
-                "hits": engine.tree_hits[strike],
-                "retail_juice": engine.retail_juice[strike],
-                "mm_juice": engine.mm_juice[strike],
-                "gamma": engine.config.GAMMA_STRENGTH.get(strike, 0),
-            })
-        
-        df = pd.DataFrame(stats)
-        df.to_csv(filepath, index=False)
+    @staticmethod
+    def _state_file(session_dir: Path) -> Path:
+        """Path of a session's game state, compressed or plain."""
+        compressed = session_dir / "game_state.json.zst"
+        return compressed if compressed.exists() else session_dir / "game_state.json"
         
     def load_game_state(self, timestamp: str) -> Dict:
         """Load a saved game state."""
@@ -167,9 +240,7 @@ class SaveManager:
             raise FileNotFoundError(f"No saved game found for timestamp {timestamp}")
             
         # Load main state
-        state_file = session_dir / "game_state.json"
-        with open(state_file, 'r') as f:
-            state = json.load(f)
+        state = read_json(self._state_file(session_dir))
             
         # Load statistics
         stats_file = session_dir / "statistics.csv"
@@ -181,18 +252,30 @@ class SaveManager:
     def list_saved_games(self) -> list:
         """List all saved game sessions."""
         saved_games = []
-        for session_dir in self.base_dir.iterdir():
-            if session_dir.is_dir():
-                state_file = session_dir / "game_state.json"
-                if state_file.exists():
-                    with open(state_file, 'r') as f:
-                        state = json.load(f)
-                        saved_games.append({
-                            "timestamp": state["timestamp"],
-                            "spot_price": state["spot_price"],
-                            "frame": state["frame"],
-                            "has_replay": (session_dir / "replay.gif").exists()
-                        })
+        with os.scandir(self.base_dir) as entries:
+            session_dirs = [Path(e.path) for e in entries if e.is_dir()]
+        for session_dir in session_dirs:
+            meta_file = session_dir / "session.meta"
+            if meta_file.exists():
+                timestamp, spot_price, frame, has_replay = meta_file.read_text().split("\t")
+                saved_games.append({
+                    "timestamp": timestamp,
+                    "spot_price": float(spot_price),
+                    "frame": int(frame),
+                    "has_replay": has_replay == "1"
+                })
+                continue
+                
+            # Sessions saved before session.meta existed
+            state_file = self._state_file(session_dir)
+            if state_file.exists():
+                state = read_json(state_file)
+                saved_games.append({
+                    "timestamp": state["timestamp"],
+                    "spot_price": state["spot_price"],
+                    "frame": state["frame"],
+                    "has_replay": (session_dir / "replay.gif").exists()
+                })
         return saved_games
 
     def set_max_frames(self, max_frames: int) -> None:
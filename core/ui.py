@@ -2,13 +2,21 @@
 UI module that handles the game's visual elements and user interaction.
 """
 
+from collections import OrderedDict
+
+import numpy as np
 import pygame
 from typing import Dict, List, Optional, Tuple
 from .engine import GameEngine, GameConfig, Coconut
 from .profiles.profile_loader import profile_manager
+from . import ui_kernels
+from .ui_kernels import juice_bar_rects
 
 class GameUI:
     """Handles game visualization and user interaction."""
+    TEXT_CACHE_SIZE = 512  # Rendered text surfaces kept between frames
+    DTE_MIN_SIZE = 6  # Smallest coconut whose DTE label is readable
+    
     def __init__(self, engine: GameEngine):
         self.engine = engine
         self.config = engine.config
@@ -22,6 +30,11 @@ class GameUI:
         # Fonts
         self.font = pygame.font.SysFont(None, 22)
         self.title_font = pygame.font.SysFont(None, 32)
+        self._text_cache: "OrderedDict[Tuple[str, Tuple[int, int, int], int], pygame.Surface]" = OrderedDict()
+        # Composited overlay panels by name, with the state they were built from
+        self._panel_cache: Dict[str, Tuple[pygame.Surface, Tuple]] = {}
+        # Translucent white backings for the live panels, by (width, height, alpha)
+        self._backings: Dict[Tuple[int, int, int], pygame.Surface] = {}
         
         # Colors
         self.COLORS = {
@@ -35,6 +48,40 @@ class GameUI:
             "gray": (128, 128, 128)
         }
         
+        # Compile the geometry kernel before the first frame
+        ui_kernels.warmup()
+        
+        # Tree positions, gamma wells and strike labels are fixed for the
+        # engine's lifetime, so bake everything static about each tree once
+        self._trees = []
+        tree_y = engine.TREE_Y
+        for strike, x, gamma in zip(engine.valid_strikes, engine.tree_x.tolist(),
+                                    engine.gamma_strength.tolist()):
+            # Gamma well - height based on gamma strength, semi-transparent blue
+            gamma_height = int(100 * gamma)
+            well = pygame.Surface((25, gamma_height))
+            well.set_alpha(int(128 * gamma))
+            well.fill((100, 100, 255))
+            well_pos = (int(x - 10), int(tree_y - gamma_height))
+            
+            trunk = pygame.Rect(int(x), int(tree_y), 5, 20)
+            label = self.font.render(str(strike), True, self.COLORS["black"])
+            label_rect = label.get_rect(center=(x + 2, tree_y + 45))
+            self._trees.append((strike, x, well, well_pos, trunk, label, label_rect))
+        
+        # One prerendered coconut per slingshot, blitted instead of drawing circles
+        self._coconut_sprites: Dict[str, pygame.Surface] = {}
+        self._dte_labels: Dict[int, pygame.Surface] = {}  # By whole DTE
+        for slingshot in self.config.SLINGSHOTS.values():
+            self._coconut_sprite(slingshot)
+        
+        # SPY/IV labels with the values they show; rebuilt if either value changes
+        self._market_labels: Optional[Tuple[float, float, pygame.Surface, pygame.Surface]] = None
+        
+        # Screen regions drawn this frame and last frame; None forces a full flip
+        self._dirty: List[pygame.Rect] = []
+        self._prev_dirty: Optional[List[pygame.Rect]] = None
+        
         # UI state
         self.hover_strike = None
         self.show_instructions = True
@@ -42,8 +89,67 @@ class GameUI:
         self.show_memories = False
         self.show_slingshots = False
 
+    def _render(self, text: str, color: Tuple[int, int, int],
+                font: Optional[pygame.font.Font] = None) -> pygame.Surface:
+        """Render antialiased text, reusing the surface from earlier frames."""
+        font = font or self.font
+        key = (text, color, id(font))
+        surface = self._text_cache.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self._text_cache[key] = surface
+            if len(self._text_cache) > self.TEXT_CACHE_SIZE:
+                self._text_cache.popitem(last=False)
+        else:
+            self._text_cache.move_to_end(key)
+        return surface
+
+    def _draw_panel(self, name: str, pos: Tuple[int, int], size: Tuple[int, int],
+                    lines: List[str], state: Optional[Tuple] = None) -> None:
+        """
+        Blit a translucent text panel, rebuilding it only when its state changes.
+        
+        The state defaults to the lines themselves; callers whose lines derive
+        from a few cheaper values can pass those instead.
+        """
+        if state is None:
+            state = tuple(lines)
+        cached = self._panel_cache.get(name)
+        if cached is None or cached[1] != state:
+            # Grow past the nominal size rather than clip overflowing lines
+            height = max(size[1], 10 + len(lines) * 20)
+            panel = pygame.Surface((size[0], height), pygame.SRCALPHA)
+            panel.fill((*self.COLORS["white"], 128))
+            for i, line in enumerate(lines):
+                panel.blit(self._render(line, self.COLORS["black"]), (10, 10 + i * 20))
+            cached = self._panel_cache[name] = (panel, state)
+        self._dirty.append(self.screen.blit(cached[0], pos))
+
+    def _backing(self, width: int, height: int, alpha: int) -> pygame.Surface:
+        """Return a translucent white panel backing, filled once per size."""
+        key = (width, height, alpha)
+        surface = self._backings.get(key)
+        if surface is None:
+            surface = pygame.Surface((width, height))
+            surface.set_alpha(alpha)
+            surface.fill(self.COLORS["white"])
+            self._backings[key] = surface
+        return surface
+
+    def _coconut_sprite(self, slingshot: Dict) -> pygame.Surface:
+        """Return the coconut sprite for a slingshot, centred in a (2*size+2) square."""
+        sprite = self._coconut_sprites.get(slingshot["name"])
+        if sprite is None:
+            size = slingshot["size"]
+            sprite = pygame.Surface((2 * size + 2, 2 * size + 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, tuple(slingshot["color"]), (size + 1, size + 1), size)
+            self._coconut_sprites[slingshot["name"]] = sprite
+        return sprite
+
     def handle_events(self) -> bool:
         """Handle user input events. Returns False if game should quit."""
+        # Only the latest mouse position matters, so hover is tested once per frame
+        mouse_pos = None
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
@@ -80,25 +186,37 @@ class GameUI:
                         self.engine.switch_slingshot(slingshot_names[idx])
                     
             elif event.type == pygame.MOUSEMOTION:
-                self.update_hover(event.pos)
+                mouse_pos = event.pos
+                
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # Window contents were lost, so the next frame repaints it all
+                self._prev_dirty = None
                 
+        if mouse_pos is not None:
+            self.update_hover(mouse_pos)
         return True
 
     def update_hover(self, mouse_pos: Tuple[int, int]) -> None:
         """Update hover state based on mouse position."""
         x, y = mouse_pos
         
-        # Check if hovering over a tree
-        for strike, tree_x in self.engine.TREE_X.items():
-            if abs(x - tree_x) < 10 and abs(y - self.engine.TREE_Y) < 40:
-                self.hover_strike = strike
-                return
+        # Check if hovering over a tree; tree_x is sorted, so only the two
+        # trees either side of the cursor can be within reach
+        if abs(y - self.engine.TREE_Y) < 40:
+            tree_x = self.engine.tree_x
+            idx = int(np.searchsorted(tree_x, x))
+            for cand in (idx - 1, idx):
+                if 0 <= cand < len(tree_x) and abs(x - tree_x[cand]) < 10:
+                    self.hover_strike = self.engine.valid_strikes[cand]
+                    return
                 
         # Check if hovering over a coconut
-        for coconut in self.engine.coconuts:
-            if abs(x - coconut.x) < 10 and abs(y - coconut.y) < 10:
-                self.hover_strike = coconut.strike
-                return
+        pool = self.engine.coconuts
+        n = pool.size
+        near = np.flatnonzero((np.abs(pool.x[:n] - x) < 10) & (np.abs(pool.y[:n] - y) < 10))
+        if near.size:
+            self.hover_strike = int(pool.strike[near[0]])
+            return
                 
         self.hover_strike = None
 
@@ -126,20 +244,13 @@ class GameUI:
             "[1-3] - Select Slingshot",
             "",
             f"Retail AI: {'ON' if self.engine.ai_enabled['retail'] else 'OFF'}",
-            f"Monkey AI: {'ON' if self.engine.ai_enabled['monkey'] else 'OFF'}",
-            f"Frame: {self.engine.frame}/{self.config.TRIALS}"
+            f"Monkey AI: {'ON' if self.engine.ai_enabled['monkey'] else 'OFF'}"
         ]
+        self._draw_panel("instructions", (10, 10), (300, 400), instructions)
         
-        # Draw semi-transparent background
-        s = pygame.Surface((300, 400))
-        s.set_alpha(128)
-        s.fill(self.COLORS["white"])
-        self.screen.blit(s, (10, 10))
-        
-        # Draw text
-        for i, line in enumerate(instructions):
-            text = self.font.render(line, True, self.COLORS["black"])
-            self.screen.blit(text, (20, 20 + i * 20))
+        # Frame counter changes every frame, so it is drawn over the panel
+        text = self._render(f"Frame: {self.engine.frame}/{self.config.TRIALS}", self.COLORS["black"])
+        self._dirty.append(self.screen.blit(text, (20, 20 + len(instructions) * 20)))
 
     def draw_profiles(self) -> None:
         """Draw current agent profiles."""
@@ -170,24 +281,9 @@ class GameUI:
             f"Defense Radius: {monkey_profile.traits.get('defense_radius', 0)}"
         ]
         
-        # Draw semi-transparent background
-        s = pygame.Surface((300, 250))
-        s.set_alpha(128)
-        s.fill(self.COLORS["white"])
-        self.screen.blit(s, (self.config.WIDTH - 310, 10))
-        
-        # Draw profile info
-        y = 20
-        for line in retail_info:
-            text = self.font.render(line, True, self.COLORS["black"])
-            self.screen.blit(text, (self.config.WIDTH - 300, y))
-            y += 20
-            
-        y += 20  # Add space between profiles
-        for line in monkey_info:
-            text = self.font.render(line, True, self.COLORS["black"])
-            self.screen.blit(text, (self.config.WIDTH - 300, y))
-            y += 20
+        # Blank line adds space between profiles
+        self._draw_panel("profiles", (self.config.WIDTH - 310, 10), (300, 250),
+                         retail_info + [""] + monkey_info)
 
     def draw_slingshots(self) -> None:
         """Draw slingshot information."""
@@ -213,16 +309,7 @@ class GameUI:
         for i, (name, slingshot) in enumerate(self.config.SLINGSHOTS.items()):
             slingshot_info.append(f"[{i+1}] {name}")
             
-        # Draw background
-        s = pygame.Surface((300, 250))
-        s.set_alpha(128)
-        s.fill(self.COLORS["white"])
-        self.screen.blit(s, (self.config.WIDTH - 310, 200))
-        
-        # Draw text
-        for i, line in enumerate(slingshot_info):
-            text = self.font.render(line, True, self.COLORS["black"])
-            self.screen.blit(text, (self.config.WIDTH - 300, 210 + i * 20))
+        self._draw_panel("slingshots", (self.config.WIDTH - 310, 200), (300, 250), slingshot_info)
 
     def draw_memories(self) -> None:
         """Draw agent memory insights."""
@@ -239,17 +326,11 @@ class GameUI:
         memory_lines.append("")  # Add spacing
         memory_lines.extend(monkey_summary.split("\n"))
         
-        # Draw background
-        height = len(memory_lines) * 20 + 20
-        s = pygame.Surface((400, height))
-        s.set_alpha(128)
-        s.fill(self.COLORS["white"])
-        self.screen.blit(s, (self.config.WIDTH - 410, 460))
-        
-        # Draw text
-        for i, line in enumerate(memory_lines):
-            text = self.font.render(line, True, self.COLORS["black"])
-            self.screen.blit(text, (self.config.WIDTH - 400, 470 + i * 20))
+        # Keyed on the summary text, so the panel is recomposited only when the
+        # text changes; the loggers may still rebuild it after curation
+        self._draw_panel("memories", (self.config.WIDTH - 410, 460),
+                         (400, len(memory_lines) * 20 + 20), memory_lines,
+                         state=(retail_summary, monkey_summary))
 
     def draw_tooltip(self) -> None:
         """Draw tooltip for hovered strike."""
@@ -257,24 +338,26 @@ class GameUI:
             return
             
         strike = self.hover_strike
+        idx = self.engine.strike_index[strike]
         info = [
             f"Strike: {strike}",
-            f"Hits: {self.engine.tree_hits[strike]}",
-            f"Retail Juice: {self.engine.retail_juice[strike]:.2f}",
-            f"MM Juice: {self.engine.mm_juice[strike]:.2f}"
+            f"Hits: {self.engine.tree_hits[idx]}",
+            f"Retail Juice: {self.engine.retail_juice[idx]:.2f}",
+            f"MM Juice: {self.engine.mm_juice[idx]:.2f}"
         ]
         
-        # Find coconuts targeting this strike
-        for coconut in self.engine.coconuts:
-            if coconut.strike == strike:
-                info.extend([
-                    f"Source: {coconut.source_agent}",
-                    f"Slingshot: {coconut.slingshot['name']}",
-                    f"Type: {coconut.slingshot['option_type'].upper()}",
-                    f"DTE: {coconut.frames_remaining//60}",
-                    "Status: In Flight"
-                ])
-                break
+        # Find the first coconut targeting this strike
+        pool = self.engine.coconuts
+        rows = np.flatnonzero(pool.strike[:pool.size] == strike)
+        if rows.size:
+            coconut = pool.view(int(rows[0]))
+            info.extend([
+                f"Source: {coconut.source_agent}",
+                f"Slingshot: {coconut.slingshot['name']}",
+                f"Type: {coconut.slingshot['option_type'].upper()}",
+                f"DTE: {coconut.frames_remaining//60}",
+                "Status: In Flight"
+            ])
                 
         # Draw tooltip background
         width = 200
@@ -283,114 +366,105 @@ class GameUI:
         x = min(x, self.config.WIDTH - width - 10)
         y = min(y, self.config.HEIGHT - height - 10)
         
-        s = pygame.Surface((width, height))
-        s.set_alpha(192)
-        s.fill(self.COLORS["white"])
-        self.screen.blit(s, (x, y))
+        s = self._backing(width, height, 192)
+        self._dirty.append(self.screen.blit(s, (x, y)))
         
         # Draw tooltip text
         for i, line in enumerate(info):
-            text = self.font.render(line, True, self.COLORS["black"])
-            self.screen.blit(text, (x + 10, y + 5 + i * 20))
+            text = self._render(line, self.COLORS["black"])
+            self._dirty.append(self.screen.blit(text, (x + 10, y + 5 + i * 20)))
 
     def draw_trees_and_juice(self) -> None:
         """Draw trees and juice bars."""
-        # Draw gamma profile background
-        for strike in self.engine.valid_strikes:
-            x = self.engine.TREE_X[strike]
-            y = self.engine.TREE_Y
-            gamma = self.engine.config.GAMMA_STRENGTH[strike]
+        engine = self.engine
+        y = engine.TREE_Y
+        bars = juice_bar_rects(engine.tree_x, float(y), engine.retail_juice, engine.mm_juice).tolist()
+        for i, (strike, x, well, well_pos, trunk, label, label_rect) in enumerate(self._trees):
+            mm_bar, retail_bar = bars[i]
             
-            # Draw gamma well - height based on gamma strength
-            gamma_height = int(100 * gamma)
-            gamma_rect = pygame.Rect(x - 10, y - gamma_height, 25, gamma_height)
-            gamma_color = (100, 100, 255, int(128 * gamma))  # Semi-transparent blue
-            s = pygame.Surface((25, gamma_height))
-            s.set_alpha(int(128 * gamma))
-            s.fill((100, 100, 255))
-            self.screen.blit(s, (x - 10, y - gamma_height))
+            # Draw gamma well
+            self._dirty.append(self.screen.blit(well, well_pos))
             
             # Tree trunk
-            pygame.draw.rect(self.screen, self.COLORS["brown"], (x, y, 5, 20))
+            self._dirty.append(pygame.draw.rect(self.screen, self.COLORS["brown"], trunk))
             
             # Juice bar
-            total = self.engine.retail_juice[strike] + self.engine.mm_juice[strike]
-            if total > 0:
-                r_ratio = self.engine.retail_juice[strike] / total
-                m_ratio = self.engine.mm_juice[strike] / total
-                
-                # Scale juice bars relative to gamma well
-                bar_height = int(80 * total)
-                
+            if mm_bar[3]:
                 # MM juice (orange)
-                pygame.draw.rect(self.screen, self.COLORS["orange"],
-                               (x + 6, y - int(m_ratio * bar_height), 8, int(m_ratio * bar_height)))
-                               
+                self._dirty.append(pygame.draw.rect(self.screen, self.COLORS["orange"], mm_bar))
+            if retail_bar[3]:
                 # Retail juice (green)
-                pygame.draw.rect(self.screen, self.COLORS["green"],
-                               (x + 6, y - bar_height, 8, int(r_ratio * bar_height)))
+                self._dirty.append(pygame.draw.rect(self.screen, self.COLORS["green"], retail_bar))
             
             # Spot price marker
             if abs(strike - self.engine.config.SPOT_PRICE) < 0.5:
-                pygame.draw.rect(self.screen, self.COLORS["red"], (x - 10, y + 25, 25, 5))
+                self._dirty.append(pygame.draw.rect(self.screen, self.COLORS["red"], (x - 10, y + 25, 25, 5)))
                 
             # Strike label
-            label = self.font.render(str(strike), True, self.COLORS["black"])
-            label_rect = label.get_rect(center=(x + 2, y + 45))
-            self.screen.blit(label, label_rect)
+            self._dirty.append(self.screen.blit(label, label_rect))
 
     def draw_coconuts(self) -> None:
         """Draw flying coconuts."""
-        for coconut in self.engine.coconuts:
-            # Use slingshot color and size from dictionary
-            color = tuple(coconut.slingshot["color"])
-            size = coconut.slingshot["size"]
-            pygame.draw.circle(self.screen, color, (int(coconut.x), int(coconut.y)), size)
+        pool = self.engine.coconuts
+        n = pool.size
+        xs = pool.x[:n].astype(np.int64).tolist()
+        ys = pool.y[:n].astype(np.int64).tolist()
+        frames = pool.frames_remaining[:n].tolist()
+        
+        # Sprites and DTE labels interleaved so overlapping coconuts stack as before
+        blit_seq = []
+        for i in range(n):
+            x, y = xs[i], ys[i]
             
-            # Draw DTE indicator
-            if coconut.frames_remaining > 0:
-                dte_text = self.font.render(
-                    f"{coconut.frames_remaining//60}", 
-                    True, 
-                    self.COLORS["white"]
-                )
-                text_rect = dte_text.get_rect(
-                    center=(int(coconut.x), int(coconut.y))
-                )
-                self.screen.blit(dte_text, text_rect)
+            # Sprite in the slingshot's color and size
+            slingshot = pool.slingshots[i]
+            offset = slingshot["size"] + 1
+            blit_seq.append((self._coconut_sprite(slingshot), (x - offset, y - offset)))
+            
+            # DTE indicator, skipped on coconuts too small to read it and in
+            # the final second when it would only show 0
+            if slingshot["size"] >= self.DTE_MIN_SIZE and frames[i] > 60:
+                dte = frames[i] // 60
+                dte_text = self._dte_labels.get(dte)
+                if dte_text is None:
+                    dte_text = self.font.render(str(dte), True, self.COLORS["white"])
+                    self._dte_labels[dte] = dte_text
+                blit_seq.append((dte_text, dte_text.get_rect(center=(x, y))))
+        self._dirty.extend(self.screen.blits(blit_seq))
 
     def draw_scoreboard(self) -> None:
         """Draw the game scoreboard."""
-        total_retail = sum(self.engine.retail_juice.values())
-        total_mm = sum(self.engine.mm_juice.values())
+        x = self.config.WIDTH - 250
+        
+        # SPY price and implied volatility at the top, in their own colors
+        spot, iv = self.config.SPOT_PRICE, self.config.IMPLIED_VOL
+        if self._market_labels is None or self._market_labels[:2] != (spot, iv):
+            self._market_labels = (
+                spot, iv,
+                self.title_font.render(f"SPY: ${spot:.2f}", True, self.COLORS["blue"]),
+                self.title_font.render(f"IV: {iv:.1f}%", True, self.COLORS["orange"])
+            )
+        self._dirty.append(self.screen.blit(self._market_labels[2], (x, 10)))
+        self._dirty.append(self.screen.blit(self._market_labels[3], (x, 40)))
         
         scores = [
-            f"SPY: ${self.config.SPOT_PRICE:.2f}",  # Add SPY price at the top
-            f"IV: {self.config.IMPLIED_VOL:.1f}%",  # Add implied volatility
-            "",  # Add spacing
-            f"Retail Total: {total_retail:.2f}",
-            f"MM Total: {total_mm:.2f}",
+            f"Retail Total: {self.engine.retail_total:.2f}",
+            f"MM Total: {self.engine.mm_total:.2f}",
             f"Frame: {self.engine.frame}/{self.config.TRIALS}"
         ]
         
-        y = 10
+        # Half-height gap below the market labels
+        y = 85
         for score in scores:
-            # Use different colors for price and IV
-            if score.startswith("SPY:"):
-                color = self.COLORS["blue"]
-            elif score.startswith("IV:"):
-                color = self.COLORS["orange"]
-            else:
-                color = self.COLORS["black"]
-                
-            text = self.title_font.render(score, True, color)
-            self.screen.blit(text, (self.config.WIDTH - 250, y))
-            y += 30 if score else 15  # Less spacing for empty lines
+            text = self._render(score, self.COLORS["black"], self.title_font)
+            self._dirty.append(self.screen.blit(text, (x, y)))
+            y += 30
 
     def draw(self) -> None:
         """Draw the complete game frame."""
         # Clear screen
         self.screen.fill(self.COLORS["white"])
+        self._dirty = []
         
         # Draw game elements
         self.draw_trees_and_juice()
@@ -404,8 +478,13 @@ class GameUI:
         self.draw_memories()
         self.draw_tooltip()
         
-        # Update display
-        pygame.display.flip()
+        # Update display. Everything is drawn over a plain white background,
+        # so only what was drawn this frame or last frame can have changed
+        if self._prev_dirty is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._prev_dirty + self._dirty)
+        self._prev_dirty = self._dirty
         self.clock.tick(self.config.FPS)
 
     def cleanup(self) -> None:
@@ -0,0 +1,49 @@
+"""
+Numeric kernels for the per-frame UI geometry.
+
+Compiled with numba when it is installed, like the simulation kernels.
+"""
+
+import numpy as np
+
+from .engine_kernels import njit
+
+@njit(cache=True)
+def juice_bar_rects(tree_x, tree_y, retail_juice, mm_juice):
+    """
+    Compute the juice bar rectangles drawn on each tree.
+    
+    Args:
+        tree_x: Tree x position per strike
+        tree_y: Shared tree base y position
+        retail_juice: Retail juice per strike
+        mm_juice: Market maker juice per strike
+        
+    Returns:
+        int32 array of shape (n, 2, 4) holding [x, y, w, h] for the MM juice
+        bar and retail juice bar of each strike. Bars are zero-sized when a
+        strike has no juice.
+    """
+    n = len(tree_x)
+    rects = np.zeros((n, 2, 4), dtype=np.int32)
+    for i in range(n):
+        # Juice bars, scaled relative to the gamma well
+        total = retail_juice[i] + mm_juice[i]
+        if total > 0:
+            x = int(tree_x[i] + 6)
+            bar_height = int(80 * total)
+            mm_height = int(mm_juice[i] / total * bar_height)
+            rects[i, 0, 0] = x
+            rects[i, 0, 1] = int(tree_y - mm_height)
+            rects[i, 0, 2] = 8
+            rects[i, 0, 3] = mm_height
+            rects[i, 1, 0] = x
+            rects[i, 1, 1] = int(tree_y - bar_height)
+            rects[i, 1, 2] = 8
+            rects[i, 1, 3] = int(retail_juice[i] / total * bar_height)
+    return rects
+
+def warmup() -> None:
+    """Compile juice_bar_rects for the dtypes GameUI passes, ahead of the first frame."""
+    values = np.zeros(1)
+    juice_bar_rects(values, 0.0, values, values)
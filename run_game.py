@@ -5,14 +5,15 @@ Main entry point for the Flying Coconuts game.
 import os
 import asyncio
 import argparse
+from typing import Optional
 from core.engine import GameEngine, GameConfig
 from core.ui import GameUI
-from core.market_data_loader import market_data
+from core.market_data_loader import get_market_data
 from core.save_manager import save_manager
 
 async def initialize_game() -> GameConfig:
     """Initialize game configuration with market data."""
-    market_state = market_data.get_market_state()
+    market_state = get_market_data().get_market_state()
     config = GameConfig(
         SPOT_PRICE=market_state["price"],
         STRIKES=market_state["strikes"],
@@ -26,11 +27,13 @@ async def main(config: GameConfig = None, save_enabled: bool = False, record_gif
         config = await initialize_game()
     
     engine = GameEngine(config)
+    engine.warmup_jit()
     ui = GameUI(engine)
     
     running = True
     last_save_frame = 0
     save_interval = 100  # Save every 100 frames when enabled
+    pending_save: Optional[asyncio.Task] = None  # Autosave still being written
     
     # Start recording if enabled
     if record_gif:
@@ -40,18 +43,35 @@ async def main(config: GameConfig = None, save_enabled: bool = False, record_gif
     try:
         while running:
             running = ui.handle_events()
-            await engine.update()
+            engine.update_sync()
             ui.draw()
             
             # Capture frame for GIF if recording
             if record_gif:
                 save_manager.capture_frame(ui.screen)
             
-            # Auto-save if enabled
+            # Auto-save if enabled, skipping this one if the last is still writing
+            if pending_save is not None and pending_save.done():
+                if pending_save.exception() is not None:
+                    print(f"Error during auto-save: {pending_save.exception()}")
+                pending_save = None
             if save_enabled and engine.frame > 0 and engine.frame % save_interval == 0:
                 if engine.frame != last_save_frame:
-                    save_manager.save_game_state(engine)
+                    if pending_save is None:
+                        pending_save = save_manager.start_save(engine)
+                    else:
+                        print(f"Skipping auto-save at frame {engine.frame}: previous save still running")
                     last_save_frame = engine.frame
+                    
+            # The frame itself never awaits, so give a pending save's task a
+            # turn to hand its write to the worker thread
+            if pending_save is not None:
+                await asyncio.sleep(0)
+        
+        # Let any auto-save finish before the final one
+        if pending_save is not None:
+            await pending_save
+            pending_save = None
         
         # Final save when game ends
         if save_enabled:
@@ -67,6 +87,12 @@ async def main(config: GameConfig = None, save_enabled: bool = False, record_gif
         import traceback
         traceback.print_exc()
     finally:
+        if pending_save is not None:
+            try:
+                await pending_save
+            except Exception as e:
+                print(f"Error during auto-save: {e}")
+        save_manager.close()
         ui.cleanup()
 
 def parse_args():